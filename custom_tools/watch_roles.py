@@ -11,18 +11,31 @@ License: MIT-like (free use/modify/distribute with attribution)
 """
 
 import asyncio
+import atexit
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from heapq import heappush, heappop
+import importlib.util
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+from queue import SimpleQueue
 import signal
 import sys
-from time import sleep
+import threading
+from time import monotonic, sleep
+import traceback
+from types import ModuleType
 from typing import Any, Optional
 from urllib.parse import urlparse  # Discord feature
+from uuid import uuid4  # Discord feature
 
 import discord  # Discord feature
 from rcon.game_logs import get_recent_logs
+from rcon.player_history import get_player_profile
 from rcon.rcon import Rcon
 from rcon.settings import SERVER_INFO
 from rcon.utils import get_server_number  # Discord feature
@@ -38,11 +51,57 @@ from custom_tools.common_functions import (
 import custom_tools.watch_roles_config as config
 
 
+class LoopQueueHandler(QueueHandler):
+    """
+    Enqueues records as they are :
+    message formatting is left to the listener thread.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def get_log_level() -> int:
+    """
+    Level is read from WATCH_ROLES_LOG_LEVEL env var, or config.LOG_LEVEL.
+    """
+    level_name = os.getenv("WATCH_ROLES_LOG_LEVEL", config.LOG_LEVEL).upper()
+    level = logging.getLevelName(level_name)
+    if not isinstance(level, int):
+        return logging.INFO
+    return level
+
+
+def setup_logging() -> tuple[logging.Logger, QueueListener]:
+    """
+    Formatting and file I/O are done by a background listener thread,
+    so logging never blocks the event loop.
+    """
+    level = get_log_level()
+
+    root_logger = logging.getLogger()
+    if not root_logger.hasHandlers():
+        logging.basicConfig(level=level)
+
+    log_queue = SimpleQueue()
+    queue_listener = QueueListener(
+        log_queue,
+        *root_logger.handlers,
+        respect_handler_level=True
+    )
+
+    module_logger = logging.getLogger(__name__)
+    module_logger.setLevel(level)
+    module_logger.addHandler(LoopQueueHandler(log_queue))
+    module_logger.propagate = False
+
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
+
+    return module_logger, queue_listener
+
+
 # Setup logger
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-if not logger.hasHandlers():
-    logging.basicConfig(level=logging.DEBUG)
+logger, log_listener = setup_logging()
 
 
 @dataclass
@@ -61,8 +120,660 @@ class PlayerData:
     actual_role: str
     abandons_thismatch: int
     lasttime_abandon: Optional[datetime]
-    allies_supports_needed: bool
-    axis_supports_needed: bool
+    abandoned: bool = False
+    support_suggested: bool = False
+
+
+@dataclass(frozen=True)
+class DecisionProfile:
+    """
+    Settings deciding which messages are sent.
+    The live one is built from the config,
+    shadow ones from config.SHADOW_PROFILES.
+    """
+    min_immune_level: int
+    always_warn_bad_officers: bool
+    always_suggest_support: bool
+    required_supports: dict[int, int]
+    support_candidates_per_squad: int
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is skipped because its sink is failing.
+    """
+
+
+class PoolSaturatedError(Exception):
+    """
+    Raised when all the blocking calls workers are busy.
+    """
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of a sink (rcon, logs, discord)
+    and skips calls to it while it's failing.
+    """
+    threshold: int
+    cooldown: int
+    failures: int = 0
+    opened_until: float = 0.0
+    probing: bool = False
+
+    def allow(self) -> bool:
+        """
+        Closed, or open for long enough to try again (half-open) :
+        only one call is let through to probe the sink
+        """
+        if self.failures < self.threshold:
+            return True
+        if self.probing or monotonic() < self.opened_until:
+            return False
+        self.probing = True
+        return True
+
+    def end_probe(self) -> None:
+        """
+        The probing call ended without any result (cancelled, dropped)
+        """
+        self.probing = False
+
+    def record_success(self) -> None:
+        """
+        Close the circuit
+        """
+        self.failures = 0
+        self.opened_until = 0.0
+        self.probing = False
+
+    def record_failure(self) -> bool:
+        """
+        (Re)open the circuit once the threshold is reached.
+        Returns True if the circuit is open.
+        """
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.threshold:
+            self.opened_until = monotonic() + self.cooldown
+            return True
+        return False
+
+
+# Errors that mean the sink itself is unreachable or failing
+TRANSPORT_ERRORS = (OSError, discord.DiscordServerError)
+
+
+class BlockingExecutor:
+    """
+    Dedicated bounded thread pool for blocking RCON/Discord calls,
+    with per-sink timeouts, circuit breakers and workers limits.
+    A sink can't have more than sink_limits[sink] calls (default : 1)
+    in its workers, including the calls that timed out but are still running,
+    so a hung sink can't take the workers of the others.
+    """
+    def __init__(
+        self,
+        max_workers: int,
+        timeouts: dict[str, int],
+        breaker_threshold: int,
+        breaker_cooldown: int,
+        queue_timeout: float,
+        sink_limits: dict[str, int],
+        name: str = "watch_roles"
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.sink_limits = sink_limits
+        self.timeouts = timeouts
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.queue_timeout = queue_timeout
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name
+        )
+        self.slots = asyncio.Semaphore(max_workers)
+        self.sink_slots: dict[str, asyncio.Semaphore] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.in_flight = 0
+        self.counters: Counter = Counter()
+
+    def _done(self, sink_slots: asyncio.Semaphore) -> None:
+        self.in_flight -= 1
+        self.slots.release()
+        sink_slots.release()
+
+    def _done_threadsafe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sink_slots: asyncio.Semaphore
+    ) -> None:
+        # The blocking call may return after the loop has been closed
+        # (shutdown while a call was hung)
+        try:
+            loop.call_soon_threadsafe(self._done, sink_slots)
+        except RuntimeError:
+            pass
+
+    async def _acquire(
+        self,
+        sink: str,
+        breaker: CircuitBreaker
+    ) -> asyncio.Semaphore:
+        """
+        Wait up to self.queue_timeout seconds for a worker of the sink,
+        then for a worker of the pool.
+        A sink whose workers are all taken by hung calls is failing.
+        """
+        sink_slots = self.sink_slots.setdefault(
+            sink, asyncio.Semaphore(self.sink_limits.get(sink, 1))
+        )
+        try:
+            await asyncio.wait_for(
+                sink_slots.acquire(),
+                timeout=self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            self.counters[f"{sink}_saturated"] += 1
+            if breaker.record_failure():
+                self.counters[f"{sink}_circuit_opened"] += 1
+            raise PoolSaturatedError(
+                f"'{sink}' workers are all busy"
+            ) from None
+        try:
+            await asyncio.wait_for(
+                self.slots.acquire(),
+                timeout=self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            sink_slots.release()
+            self.counters["pool_saturated"] += 1
+            raise PoolSaturatedError(
+                f"{self.in_flight} blocking calls in flight"
+            ) from None
+        except BaseException:
+            sink_slots.release()
+            raise
+        return sink_slots
+
+    async def run(
+        self,
+        sink: str,
+        func,
+        *args,
+        **kwargs
+    ):
+        """
+        Run func(*args, **kwargs) in the pool.
+        If every worker of the sink (or of the pool) is busy,
+        waits up to self.queue_timeout seconds for a free one,
+        then drops the call (PoolSaturatedError).
+        Only timeouts, transport errors (OSError, Discord 5xx)
+        and workers all taken by hung calls
+        count as sink failures for the circuit breaker :
+        a command refused by the game server doesn't mean it is down.
+        Raises CircuitOpenError, PoolSaturatedError, TimeoutError
+        or any exception raised by func.
+        """
+        breaker = self.breakers.setdefault(
+            sink,
+            CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        )
+        if not breaker.allow():
+            self.counters[f"{sink}_skipped"] += 1
+            raise CircuitOpenError(f"'{sink}' circuit is open")
+        probe = breaker.probing
+        try:
+            return await self._run(sink, breaker, func, *args, **kwargs)
+        finally:
+            # No-op if the call has been recorded as a success or a failure
+            if probe:
+                breaker.end_probe()
+
+    async def _run(
+        self,
+        sink: str,
+        breaker: CircuitBreaker,
+        func,
+        *args,
+        **kwargs
+    ):
+        # Bounded wait : don't queue forever behind hung calls
+        sink_slots = await self._acquire(sink, breaker)
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            future = self.pool.submit(func, *args, **kwargs)
+        except RuntimeError:
+            # Pool shut down
+            self._done(sink_slots)
+            raise
+        # Runs when the blocking call returns,
+        # even if the awaiting coroutine has already timed out
+        future.add_done_callback(
+            lambda _future: self._done_threadsafe(loop, sink_slots)
+        )
+
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.timeouts.get(sink, 10)
+            )
+        except asyncio.TimeoutError:
+            # Drop the call if it didn't start yet
+            # (a running thread can't be interrupted)
+            future.cancel()
+            self.counters[f"{sink}_timeouts"] += 1
+            if breaker.record_failure():
+                self.counters[f"{sink}_circuit_opened"] += 1
+            raise TimeoutError(f"'{sink}' call timed out") from None
+        except TRANSPORT_ERRORS:
+            self.counters[f"{sink}_errors"] += 1
+            if breaker.record_failure():
+                self.counters[f"{sink}_circuit_opened"] += 1
+            raise
+        except Exception:
+            # The sink answered : it is up
+            self.counters[f"{sink}_errors"] += 1
+            breaker.record_success()
+            raise
+
+        breaker.record_success()
+        return result
+
+    def log_stats(self) -> None:
+        """
+        Log the counters, if anything went wrong since the last call
+        """
+        if self.counters:
+            logger.info(
+                "Blocking calls (%s) : %s in flight - %s",
+                self.name,
+                self.in_flight,
+                ", ".join(
+                    f"{key}={value}"
+                    for key, value in sorted(self.counters.items())
+                )
+            )
+            self.counters.clear()
+
+
+executor = BlockingExecutor(
+    max_workers=config.EXECUTOR_MAX_WORKERS,
+    timeouts=config.CALL_TIMEOUTS,
+    breaker_threshold=config.CIRCUIT_BREAKER_THRESHOLD,
+    breaker_cooldown=config.CIRCUIT_BREAKER_COOLDOWN,
+    queue_timeout=config.EXECUTOR_QUEUE_TIMEOUT,
+    sink_limits=config.SINK_MAX_WORKERS
+)
+
+# Each of the 3 caches gets a third of lookup_executor's workers
+LOOKUP_CONCURRENCY = max(1, config.LOOKUP_MAX_WORKERS // 3)
+
+# Profile lookups (mostly background prefetches) get their own small pool,
+# so a burst of joining players can't take the workers needed
+# to poll the players list and send messages
+lookup_executor = BlockingExecutor(
+    max_workers=config.LOOKUP_MAX_WORKERS,
+    timeouts=config.CALL_TIMEOUTS,
+    breaker_threshold=config.CIRCUIT_BREAKER_THRESHOLD,
+    breaker_cooldown=config.CIRCUIT_BREAKER_COOLDOWN,
+    queue_timeout=config.EXECUTOR_QUEUE_TIMEOUT,
+    sink_limits={
+        "profiles": 2 * LOOKUP_CONCURRENCY,  # avatar_urls and profile_urls
+        "languages": LOOKUP_CONCURRENCY
+    },
+    name="watch_roles_lookups"
+)
+
+
+class LoopLagWatchdog:
+    """
+    Measures the event loop lag using a heartbeat task.
+    A watcher thread logs the main thread's stack
+    when the heartbeat is late by more than config.LAG_WATCHDOG_THRESHOLD.
+    """
+    def __init__(
+        self,
+        interval: float = 0.1
+    ):
+        self.interval = interval
+        self.phase = "startup"
+        self.last_beat = monotonic()
+        self.max_lag = 0.0
+        self.lag_events = 0
+        self.main_thread_id = threading.main_thread().ident
+        self.task: Optional[asyncio.Task] = None
+
+    async def heartbeat(self) -> None:
+        """
+        Should wake up every 'interval' seconds
+        """
+        while True:
+            expected = monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_beat = monotonic()
+            self.max_lag = max(self.max_lag, self.last_beat - expected)
+
+    def watch(self) -> None:
+        """
+        Watcher thread : reports each blocking episode once
+        """
+        reported = False
+        while True:
+            sleep(self.interval)
+            threshold = config.LAG_WATCHDOG_THRESHOLD
+            lag = monotonic() - self.last_beat
+            if threshold <= 0 or lag < threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            self.lag_events += 1
+
+            frame = sys._current_frames().get(self.main_thread_id)
+            stack = (
+                "".join(traceback.format_stack(frame))
+                if frame else "(unavailable)\n"
+            )
+            logger.warning(
+                "🐢 Event loop blocked for %.2f s during '%s' (#%s) :\n%s",
+                lag,
+                self.phase,
+                self.lag_events,
+                stack
+            )
+
+    def start(self) -> None:
+        """
+        Must be called from the event loop.
+        Does nothing if already running
+        (the watcher thread idles while config.LAG_WATCHDOG_THRESHOLD is 0)
+        """
+        if self.task is not None:
+            return
+        self.last_beat = monotonic()
+        threading.Thread(
+            target=self.watch,
+            name="watch_roles_lag_watchdog",
+            daemon=True
+        ).start()
+        self.task = asyncio.create_task(self.heartbeat())
+
+    def log_stats(self) -> None:
+        """
+        Log the worst lag measured since the last call
+        """
+        if self.task is None:
+            return
+        logger.debug(
+            "Event loop max lag : %.3f s (%s blocking episodes so far)",
+            self.max_lag,
+            self.lag_events
+        )
+        self.max_lag = 0.0
+
+
+watchdog = LoopLagWatchdog()
+
+
+class AsyncTTLCache:
+    """
+    Bounded LRU cache whose entries expire after 'ttl' seconds.
+    Values are loaded by a blocking function run in lookup_executor ;
+    concurrent misses on the same key share a single load.
+    The loads waiting for one of the 'concurrency' slots are queued here,
+    so the caches sharing lookup_executor shouldn't have
+    more slots in total than its workers.
+    """
+    def __init__(
+        self,
+        sink: str,
+        maxsize: int,
+        ttl: int,
+        concurrency: int = 2
+    ):
+        self.sink = sink
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.pending: dict[Any, asyncio.Future] = {}
+        self.prefetch_tasks: set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _load(
+        self,
+        key,
+        func,
+        *args
+    ) -> None:
+        future = self.pending[key]
+        try:
+            async with self._semaphore:
+                value = await lookup_executor.run(self.sink, func, *args)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            self.entries[key] = (monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            future.set_result(value)
+        finally:
+            del self.pending[key]
+
+    async def get(
+        self,
+        key,
+        func,
+        *args
+    ):
+        """
+        Returns the cached value, or func(*args) if missing or expired.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > monotonic():
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        self.prefetch(key, func, *args)
+
+        # Shielded : a cancelled caller doesn't cancel the shared load
+        return await asyncio.shield(self.pending[key])
+
+    def peek(
+        self,
+        key,
+        default=None
+    ):
+        """
+        Returns the cached value without waiting for any load.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= monotonic():
+            return default
+        return entry[1]
+
+    def prefetch(
+        self,
+        key,
+        func,
+        *args
+    ) -> None:
+        """
+        Load the value in the background, if it's not already cached.
+        """
+        entry = self.entries.get(key)
+        if key in self.pending or (entry is not None and entry[0] > monotonic()):
+            return
+        self.entries.pop(key, None)  # Expired
+        self.pending[key] = asyncio.get_running_loop().create_future()
+        # Nobody may await it : don't log "exception was never retrieved"
+        self.pending[key].add_done_callback(
+            lambda future: future.cancelled() or future.exception()
+        )
+        task = asyncio.create_task(self._load(key, func, *args))
+        self.prefetch_tasks.add(task)
+        task.add_done_callback(self.prefetch_tasks.discard)
+
+
+# Discord alerts players data
+avatar_urls = AsyncTTLCache(
+    "profiles",
+    config.PROFILE_CACHE_SIZE,
+    config.PROFILE_CACHE_TTL,
+    LOOKUP_CONCURRENCY
+)
+profile_urls = AsyncTTLCache(
+    "profiles",
+    config.PROFILE_CACHE_SIZE,
+    config.PROFILE_CACHE_TTL,
+    LOOKUP_CONCURRENCY
+)
+
+
+# Players languages (looked up when they join, kept for a day)
+player_languages = AsyncTTLCache(
+    "languages", config.PROFILE_CACHE_SIZE, 86400, LOOKUP_CONCURRENCY
+)
+
+
+def lookup_player_language(
+    player_id: str
+) -> Optional[str]:
+    """
+    Blocking : the player's language from config.PLAYER_LANGUAGES,
+    or guessed from the country in their CRCON profile.
+    """
+    preference = config.PLAYER_LANGUAGES.get(player_id)
+    if preference:
+        return preference
+
+    profile = get_player_profile(player_id, 0) or {}
+    country = (profile.get("steaminfo") or {}).get("country")
+    if not country:
+        return None
+    return config.COUNTRY_LANGUAGES.get(country.upper())
+
+
+def get_player_language(
+    player_id: str
+) -> str:
+    """
+    The player's language, if it has already been looked up and is available.
+    Never waits.
+    """
+    language = player_languages.peek(player_id)
+    if config.PER_PLAYER_LANGUAGE and language in derived_config.messages:
+        return language
+    return derived_config.default_language
+
+
+async def get_cached_urls(
+    player_id: str,
+    name: str
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Returns the player's external profile and avatar urls
+    (None if they can't be found).
+    """
+    results = await asyncio.gather(
+        profile_urls.get(
+            (player_id, name), get_external_profile_url, player_id, name
+        ),
+        avatar_urls.get(player_id, get_avatar_url, player_id),
+        return_exceptions=True
+    )
+    return tuple(
+        None if isinstance(result, BaseException) else result
+        for result in results
+    )
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel : schedule, cancel and expire timers in O(1).
+    Each slot holds the timers due when the wheel points to it,
+    along with the number of full turns left before they expire.
+    """
+    def __init__(
+        self,
+        tick: float,
+        slots: int = 64
+    ):
+        self.tick = tick
+        self.slots: list[dict[Any, int]] = [{} for _ in range(slots)]
+        self.timers: dict[Any, int] = {}  # key : slot index
+        self.current_tick: Optional[int] = None
+
+    def schedule(
+        self,
+        key,
+        delay: float,
+        now: float
+    ) -> None:
+        """
+        (Re)start the timer 'key', expiring in 'delay' seconds
+        """
+        self.cancel(key)
+        if self.current_tick is None:
+            self.current_tick = int(now // self.tick)
+        ticks = max(1, round(delay / self.tick))
+        slot = (self.current_tick + ticks) % len(self.slots)
+        self.slots[slot][key] = (ticks - 1) // len(self.slots)
+        self.timers[key] = slot
+
+    def cancel(
+        self,
+        key
+    ) -> None:
+        """
+        Stop the timer 'key', if any
+        """
+        slot = self.timers.pop(key, None)
+        if slot is not None:
+            del self.slots[slot][key]
+
+    def clear(self) -> None:
+        """
+        Stop all the timers
+        """
+        for slot in self.slots:
+            slot.clear()
+        self.timers.clear()
+
+    def __contains__(self, key) -> bool:
+        return key in self.timers
+
+    def advance(
+        self,
+        now: float
+    ) -> list:
+        """
+        Move the wheel up to 'now'.
+        Returns the keys of the expired timers.
+        """
+        target_tick = int(now // self.tick)
+        if self.current_tick is None:
+            self.current_tick = target_tick
+        expired = []
+        # Never process a slot twice in a single call
+        first_tick = max(self.current_tick, target_tick - len(self.slots))
+        for tick in range(first_tick + 1, target_tick + 1):
+            slot = self.slots[tick % len(self.slots)]
+            for key, rounds in list(slot.items()):
+                if rounds > 0:
+                    slot[key] = rounds - 1
+                    continue
+                del slot[key]
+                del self.timers[key]
+                expired.append(key)
+        self.current_tick = target_tick
+        return expired
 
 
 async def limited_task(
@@ -91,129 +802,236 @@ def is_valid_url(
         return False
 
 
-def is_support_needed(
-    realtime_all: dict
-) -> tuple[bool, bool]:
+def get_supports_deficit(
+    team_counts: dict[str, dict[str, int]],
+    required_supports: dict[int, int]
+) -> dict[str, int]:
     """
-    Check if support roles are needed
+    Count the missing support roles
     based on the number of infantry officers and supports in each team,
-    as set in config.REQUIRED_SUPPORTS :
+    as set in required_supports (config.REQUIRED_SUPPORTS) :
     REQUIRED_SUPPORTS = {0:0, 1:1, 2:1, 3:2, 4:2, 5:3, 6:3, 7:4, 8:4, 9:5}
 
-    Returns a tuple of 2 booleans indicating if allies and/or axis need supports.
+    Returns a dict giving the number of missing supports for allies and axis.
     """
-    counts = {
-        "allies": {"officer": 0, "support": 0},
-        "axis": {"officer": 0, "support": 0}
+    return {
+        team: max(
+            0,
+            required_supports.get(counts["officer"], 0) - counts["support"]
+        )
+        for team, counts in team_counts.items()
     }
 
-    for realtime_player in realtime_all["players"].values():
-        tested_team = realtime_player.get('team')
-        tested_role = realtime_player.get('role')
 
-        if tested_team in counts and tested_role in counts[tested_team]:
-            counts[tested_team][tested_role] += 1
-
-    allies_supports_needed = (
-        counts["allies"]["support"]
-        < config.REQUIRED_SUPPORTS.get(counts["allies"]["officer"], 0)
-    )
-    axis_supports_needed = (
-        counts["axis"]["support"]
-        < config.REQUIRED_SUPPORTS.get(counts["axis"]["officer"], 0)
-    )
+class PlayersSnapshot:
+    """
+    Squads and teams facts of a get_detailed_players() snapshot,
+    computed in a single pass and shared by every decision of the poll.
+    Squads are keyed by (team, unit_name).
+    """
+    def __init__(
+        self,
+        realtime_all: dict
+    ):
+        self.players = realtime_all.get("players", {})
+
+        # Infantry officers and supports in each team
+        self.team_counts = {
+            "allies": {"officer": 0, "support": 0},
+            "axis": {"officer": 0, "support": 0}
+        }
+
+        # Squads sizes, commander excluded
+        self.squads_sizes: dict[tuple[str, str], int] = {}
+        self.squads_with_support: set[tuple[str, str]] = set()
+        self.squads_with_officer: set[tuple[str, str]] = set()
+
+        # Local names : this loop runs over every player on each poll
+        team_counts = self.team_counts
+        squads_sizes = self.squads_sizes
+        squads_with_support = self.squads_with_support
+        squads_with_officer = self.squads_with_officer
+        officers = OFFICERS
+
+        for realtime_player in self.players.values():
+            try:
+                team = realtime_player["team"]
+                unit = realtime_player["unit_name"]
+                role = realtime_player["role"]
+                realtime_player["player_id"]
+            except KeyError:
+                continue  # Skip players with incomplete data
+
+            if role == "officer" or role == "support":
+                counts = team_counts.get(team)
+                if counts is not None:
+                    counts[role] += 1
+
+            if not unit or unit == "command":
+                continue
+            squad = (team, unit)
+            squads_sizes[squad] = squads_sizes.get(squad, 0) + 1
+            if role == "support":
+                squads_with_support.add(squad)
+            elif role in officers:
+                squads_with_officer.add(squad)
+
+        # Infantry squads in which nobody plays support
+        self.squads_without_support: dict[tuple[str, str], int] = {
+            squad: size
+            for squad, size in squads_sizes.items()
+            if squad not in squads_with_support and squad[1] != "unassigned"
+        }
+
+    def was_alone_in_squad(
+        self,
+        playerclass: PlayerData
+    ) -> bool:
+        """
+        Was the player alone in its previous squad ?
+        (If so : he won't get the "quitting officer" warning if he leaves it)
+        """
+        # He was unassigned
+        if not playerclass.known_unit_name:
+            return True
 
-    return allies_supports_needed, axis_supports_needed
+        # Commander is always alone in its "command" squad,
+        # but he can be considered as the officer of the whole team
+        if playerclass.known_unit_name == "command":
+            return False
 
+        known_squad = (playerclass.known_team, playerclass.known_unit_name)
 
-def was_alone_in_squad(
-    playerclass: PlayerData,
-    realtime_all: dict
-) -> bool:
+        # Don't count the player if he's still in the same squad
+        still_there = known_squad == (
+            playerclass.actual_team, playerclass.actual_unit_name
+        )
+        return self.squads_sizes.get(known_squad, 0) - still_there == 0
+
+    def squads_members(self) -> dict[tuple[str, str], list[dict]]:
+        """
+        Returns the players of each (team, unit_name), commander excluded.
+        Built on demand (officer vacancies) : most polls don't need it.
+        """
+        squads: dict[tuple[str, str], list[dict]] = {}
+        for realtime_player in self.players.values():
+            try:
+                squad = (realtime_player["team"], realtime_player["unit_name"])
+                realtime_player["role"]
+                realtime_player["player_id"]
+            except KeyError:
+                continue
+            if squad[1] and squad[1] not in ("command", "unassigned"):
+                squads.setdefault(squad, []).append(realtime_player)
+        return squads
+
+
+def update_officer_vacancies(
+    vacancies: TimerWheel,
+    reminded: set[tuple[str, str]],
+    snapshot: PlayersSnapshot,
+    now: float
+) -> list[tuple[tuple[str, str], list[dict]]]:
     """
-    Was the player alone in its previous squad ?
-    (If so : he won't get the "quitting officer" warning if he leaves it)
+    Start a timer for each squad (2+ players) without officer,
+    cancel it as soon as someone takes the role,
+    the squad drops to a single player or disappears.
+    The squads are reminded once per vacancy ('reminded').
+
+    Returns the squads that have been without officer
+    for config.OFFICER_VACANCY_DELAY seconds,
+    and their members below MIN_IMMUNE_LEVEL.
     """
-    # He was unassigned
-    if not playerclass.known_unit_name:
-        return True
-
-    # Commander is always alone in its "command" squad,
-    # but he can be considered as the officer of the whole team
-    if playerclass.known_unit_name == "command":
-        return False
-
-    for realtime_player in realtime_all.get("players", {}).values():
-        try:
-            tested_player_id = realtime_player["player_id"]
-            tested_team = realtime_player["team"]
-            tested_unit = realtime_player["unit_name"]
-        except KeyError:
-            continue  # Skip players with incomplete data
+    squads_with_officer = snapshot.squads_with_officer
+    vacant_squads = {
+        squad: members
+        for squad, members in snapshot.squads_members().items()
+        if squad not in squads_with_officer and len(members) > 1
+    }
 
-        # Don't test
-        if (
-            tested_player_id == playerclass.player_id
-            or not tested_unit  # Unassigned
-            or tested_unit == "command"  # Commander
-        ):
+    min_immune_level = derived_config.live_profile.min_immune_level
+    expired = []
+    for squad in vacancies.advance(now):
+        if squad not in vacant_squads:
             continue
+        reminded.add(squad)
+        expired.append((
+            squad,
+            [
+                realtime_player for realtime_player in vacant_squads[squad]
+                if realtime_player.get("level", 0) < min_immune_level
+            ]
+        ))
 
-        # Someone still plays in same team/squad the player was in
-        if (
-            tested_team == playerclass.known_team
-            and tested_unit == playerclass.known_unit_name
-        ):
-            return False
+    for squad in list(vacancies.timers):
+        if squad not in vacant_squads:
+            vacancies.cancel(squad)
+    reminded.intersection_update(vacant_squads)
 
-    return True
+    for squad in vacant_squads:
+        if squad not in vacancies and squad not in reminded:
+            vacancies.schedule(squad, config.OFFICER_VACANCY_DELAY, now)
 
+    return expired
 
-def is_this_role_taken_in_squad(
-    playerclass: PlayerData,
-    realtime_all: dict,
-    target_role: str = "support"
-) -> bool:
-    """
-    Is there a player with the target_role in player's team/unit ?
+
+def select_support_candidates(
+    team_counts: dict[str, dict[str, int]],
+    squads_without_support: dict[tuple[str, str], int],
+    changed_players: list[PlayerData],
+    profile: DecisionProfile
+) -> set[str]:
     """
-    # Player is either unassigned or commander
-    if (
-        playerclass.actual_unit_name == "unassigned"
-        or playerclass.actual_unit_name == "command"
-    ):
-        return False
+    Choose the players who will be suggested to take the support role.
+    For each missing support in a team, the biggest squad without support
+    gets its best candidates (riflemen first, then most experienced players)
+    among the players who just changed role.
 
-    # Player already plays target_role
-    if playerclass.actual_role == target_role:
-        return True
+    Returns the selected players ids.
+    """
+    deficits = get_supports_deficit(team_counts, profile.required_supports)
+    if not any(deficits.values()):
+        return set()
 
-    for realtime_player in realtime_all.get("players", {}).values():
-        try:
-            tested_player_id = realtime_player["player_id"]
-            tested_team = realtime_player["team"]
-            tested_unit = realtime_player["unit_name"]
-            tested_role = realtime_player["role"]
-        except KeyError:
-            continue  # Skip players with incomplete data
-
-        # Don't test
+    candidates: dict[tuple[str, str], list[PlayerData]] = {}
+    for playerclass in changed_players:
+        squad = (playerclass.actual_team, playerclass.actual_unit_name)
         if (
-            tested_player_id == playerclass.player_id
-            or not tested_unit  # Unassigned
-            or tested_unit == "command"  # Commander
+            squad in squads_without_support
+            and playerclass.actual_role in SUPPORT_CANDIDATES
+            and (
+                profile.always_suggest_support
+                or playerclass.actual_level < profile.min_immune_level
+            )
         ):
-            continue
+            candidates.setdefault(squad, []).append(playerclass)
 
-        # Someone plays target_role in player's team/unit
-        if (
-            tested_team == playerclass.actual_team
-            and tested_unit == playerclass.actual_unit_name
-            and tested_role == target_role
-        ):
-            return True
+    selected = set()
+    for team, deficit in deficits.items():
+        ranked_squads = sorted(
+            (
+                squad for squad in squads_without_support
+                if squad[0] == team and squad in candidates
+            ),
+            key=lambda squad: squads_without_support[squad],
+            reverse=True
+        )
+        for squad in ranked_squads[:deficit]:
+            ranked_candidates = sorted(
+                candidates[squad],
+                key=lambda playerclass: (
+                    playerclass.actual_role != "rifleman",
+                    -playerclass.actual_level
+                )
+            )
+            selected.update(
+                playerclass.player_id
+                for playerclass in ranked_candidates[
+                    :profile.support_candidates_per_squad
+                ]
+            )
 
-    return False
+    return selected
 
 
 def clean_departed_players(
@@ -237,10 +1055,6 @@ def clean_departed_players(
                 known_player.get('name', '(unknown)'),
                 known_player.get('level', '(unknown)')
             )
-            logger.debug(
-                "'known_all' dict now contains %s entries",
-                len(known_all)
-            )
 
     return known_all
 
@@ -265,7 +1079,8 @@ async def reset_on_match_end(
         #     min_timestamp=min_timestamp,
         #     exact_action=True
         # )
-        recent_logs = await asyncio.to_thread(
+        recent_logs = await executor.run(
+            "logs",
             get_recent_logs,
             action_filter=["MATCH ENDED"],
             min_timestamp=min_timestamp,
@@ -304,7 +1119,7 @@ async def reset_on_match_end(
             entries_reset,
             sleep_duration
         )
-        sleep(sleep_duration)
+        await asyncio.sleep(sleep_duration)
 
     return known_all
 
@@ -312,7 +1127,7 @@ async def reset_on_match_end(
 def clean_old_entries(
     now_dt: datetime,
     known_all: dict,
-    delay: int = config.AUTO_CLEANING_TIME
+    delay: Optional[int] = None
 ) -> dict:
     """
     Remove entries that haven't changed in the last 'delay' minutes.
@@ -329,6 +1144,9 @@ def clean_old_entries(
                 player_id)
             )
 
+    if delay is None:
+        delay = config.AUTO_CLEANING_TIME
+
     # Remove outdated entries
     oldest_change_allowed_time = now_dt - timedelta(minutes=delay)
 
@@ -341,10 +1159,6 @@ def clean_old_entries(
                 known_player.get('name', '(unknown)'),
                 known_player.get('level', '(unknown)')
             )
-            logger.debug(
-                "'known_all' dict now contains %s entries",
-                len(known_all)
-            )
 
     return known_all
 
@@ -365,87 +1179,180 @@ def is_recent_abandon(
     )
 
 
-async def send_message_async(
-    rcon: Rcon,
+def decide_alert(
+    playerclass: PlayerData
+) -> bool:
+    """
+    Should the player's abandonment be reported on Discord ?
+    """
+    return bool(
+        playerclass.abandoned
+        and derived_config.webhook_url
+        and derived_config.alerts_enabled
+    )
+
+
+def decide_message(
     playerclass: PlayerData,
-    realtime_all: dict,
-    watch_interval: int
-) -> None:
+    profile: DecisionProfile,
+    support_suggested: bool
+) -> tuple[bool, bool, bool]:
+    """
+    Which parts of the message should the player get ?
+
+    Returns (officer warning, support suggestion, role guidance).
+    """
+    warn_officer = (
+        playerclass.abandoned
+        and (
+            profile.always_warn_bad_officers
+            or playerclass.actual_level < profile.min_immune_level
+        )
+    )
+    guide_role = bool(
+        playerclass.actual_unit_name  # Don't guide unassigned "rifleman"
+        and playerclass.actual_level < profile.min_immune_level
+    )
+    return warn_officer, support_suggested, guide_role
+
+
+def render_message(
+    playerclass: PlayerData,
+    warn_officer: bool,
+    suggest_support: bool,
+    guide_role: bool
+) -> str:
     """
-    Asynchronously send a message to the player based on their role and status.
+    Build the message in the player's language.
     """
+    language = get_player_language(playerclass.player_id)
     msg = ""
 
     # Warn quitting officers
-    if (
-        is_recent_abandon(playerclass.lasttime_abandon, watch_interval)
-        and not was_alone_in_squad(playerclass, realtime_all)
-        and (
-            config.ALWAYS_WARN_BAD_OFFICERS
-            or playerclass.actual_level < config.MIN_IMMUNE_LEVEL
-        )
-    ):
-        msg += config.MESSAGE_TEXT.get(
-            "officer_quitter", '(Missing translation)'
-        )
-        msg += config.MESSAGE_TEXT.get(
-            'nb_squads_abandoned', '(Missing translation)'
-        )
+    if warn_officer:
+        msg += derived_config.officer_warnings[language]
         msg += f" : {playerclass.abandons_thismatch}\n----------\n"
 
     # Suggest taking support role
-    if (
-        (
-            (
-                playerclass.actual_team == "allies"
-                and playerclass.allies_supports_needed
-            )
-            or (
-                playerclass.actual_team == "axis"
-                and playerclass.axis_supports_needed
-            )
-        )
-        and not is_this_role_taken_in_squad(playerclass, realtime_all, "support")
-        and playerclass.actual_role in SUPPORT_CANDIDATES
-        and (
-            config.ALWAYS_SUGGEST_SUPPORT
-            or playerclass.actual_level < config.MIN_IMMUNE_LEVEL
-        )
-    ):
-        msg += config.MESSAGE_TEXT.get(
+    if suggest_support:
+        msg += derived_config.messages[language].get(
             "support_needed", '(Missing translation)'
         )
 
     # Actual role guidance
-    if (
-        playerclass.actual_unit_name  # Don't guide unassigned "rifleman"
-        and playerclass.actual_level < config.MIN_IMMUNE_LEVEL
-    ):
-        msg += config.MESSAGE_TEXT.get(
+    if guide_role:
+        msg += derived_config.messages[language].get(
             playerclass.actual_role, '(Missing translation)'
         )
 
-    # Send in-game message
-    if msg:
-        try:
-            await asyncio.to_thread(
-                rcon.message_player,
-                player_id=playerclass.player_id,
-                message=msg,
-                by=config.BOT_NAME
-            )
-        except Exception as error:
-            logger.warning(
-                "⚠️ '%s' (%s) - Couldn't send message : %s",
-                playerclass.name,
-                playerclass.actual_level,
-                str(error)
+    return msg
+
+
+def decide_actions(
+    snapshot: PlayersSnapshot,
+    changed_players: list[PlayerData],
+    watch_interval: int
+) -> tuple[list[tuple[PlayerData, str]], list[PlayerData]]:
+    """
+    Single decision pass over the players who changed role.
+    Sets their 'abandoned' and 'support_suggested' flags.
+
+    Returns the messages to send and the players to report on Discord.
+    """
+    # Did the player just quit an officer role,
+    # leaving players in their previous team/squad ?
+    for playerclass in changed_players:
+        playerclass.abandoned = (
+            is_recent_abandon(playerclass.lasttime_abandon, watch_interval)
+            and not snapshot.was_alone_in_squad(playerclass)
+        )
+
+    support_candidates = select_support_candidates(
+        snapshot.team_counts,
+        snapshot.squads_without_support,
+        changed_players,
+        derived_config.live_profile
+    )
+
+    messages = []
+    alerts = []
+    for playerclass in changed_players:
+        playerclass.support_suggested = (
+            playerclass.player_id in support_candidates
+        )
+        msg = render_message(
+            playerclass,
+            *decide_message(
+                playerclass,
+                derived_config.live_profile,
+                playerclass.support_suggested
             )
+        )
+        if msg:
+            messages.append((playerclass, msg))
+        if decide_alert(playerclass):
+            alerts.append(playerclass)
+
+    return messages, alerts
+
+
+async def send_message_async(
+    rcon: Rcon,
+    playerclass: PlayerData,
+    msg: str
+) -> None:
+    """
+    Asynchronously send a message to the player.
+    """
+    try:
+        await executor.run(
+            "rcon_message",
+            rcon.message_player,
+            player_id=playerclass.player_id,
+            message=msg,
+            by=config.BOT_NAME
+        )
+    except Exception as error:
+        logger.warning(
+            "⚠️ '%s' (%s) - Couldn't send message : %s",
+            playerclass.name,
+            playerclass.actual_level,
+            str(error)
+        )
+
+
+async def send_vacancy_message_async(
+    rcon: Rcon,
+    realtime_player: dict
+) -> None:
+    """
+    Asynchronously ask a player to take the officer role in their squad.
+    """
+    language = get_player_language(realtime_player["player_id"])
+    try:
+        await executor.run(
+            "rcon_message",
+            rcon.message_player,
+            player_id=realtime_player["player_id"],
+            message=derived_config.messages[language].get(
+                "officer_vacancy", '(Missing translation)'
+            ),
+            by=config.BOT_NAME
+        )
+    except Exception as error:
+        logger.warning(
+            "⚠️ '%s' (%s) - Couldn't send message : %s",
+            realtime_player.get("name", "(unknown)"),
+            realtime_player.get("level", "(unknown)"),
+            str(error)
+        )
 
 
-def get_discord_webhook_config() -> tuple[str, bool]:
+def get_discord_webhook_config(
+    cfg: ModuleType
+) -> tuple[Optional[str], bool]:
     """
-    Reads config.SERVER_CONFIG
+    Reads cfg.SERVER_CONFIG
     SERVER_CONFIG = [
         ["https://discord.com/api/webhooks/...", False],  # Server 1
         ["https://discord.com/api/webhooks/...", False],  # Server 2
@@ -453,9 +1360,10 @@ def get_discord_webhook_config() -> tuple[str, bool]:
 
     Returns current server's config if any.
     """
+    server_number = None
     try:
         server_number = int(get_server_number())
-        config_entry = config.SERVER_CONFIG[server_number - 1]
+        config_entry = cfg.SERVER_CONFIG[server_number - 1]
 
         if (
             isinstance(config_entry, list)
@@ -474,49 +1382,288 @@ def get_discord_webhook_config() -> tuple[str, bool]:
             server_number,
             str(error)
         )
-        return [None, False]
+        return None, False
 
-    return [webhook_url, alerts_enabled]
+    return webhook_url, alerts_enabled
 
 
-async def send_discord_alert_async(
-    playerclass: PlayerData,
-    realtime_all: dict,
-    watch_interval: int = 30
+@dataclass(frozen=True)
+class DerivedConfig:
+    """
+    Values computed once from the config module,
+    rebuilt when the config file changes.
+    """
+    watch_interval: int
+    semaphore_limit: int
+    default_language: str
+    messages: dict[str, dict[str, str]]
+    officer_warnings: dict[str, str]
+    webhook_url: Optional[str]
+    alerts_enabled: bool
+    live_profile: DecisionProfile
+    shadow_profiles: dict[str, DecisionProfile]
+
+
+def validate_config(
+    cfg: ModuleType
 ) -> None:
     """
-    Asynchronously send a Discord alert when an officer quits.
+    Check the types of the config values.
+    Raises ValueError if something is wrong.
     """
-    # Do we have to send an alert ?
-    # (The player had to play an officer role
-    # and have abandoned a team/squad in which there are still players).
+    expected_types = {
+        "WATCH_INTERVAL": int,
+        "MIN_IMMUNE_LEVEL": int,
+        "ALWAYS_WARN_BAD_OFFICERS": bool,
+        "REQUIRED_SUPPORTS": dict,
+        "SUPPORT_CANDIDATES_PER_SQUAD": int,
+        "ALWAYS_SUGGEST_SUPPORT": bool,
+        "SERVER_CONFIG": list,
+        "MESSAGE_TEXT": dict,
+        "BOT_NAME": str,
+        "LOG_LEVEL": str,
+        "AUTO_CLEANING_TIME": int,
+        "SEMAPHORE_LIMIT": int,
+        "EXECUTOR_MAX_WORKERS": int,
+        "EXECUTOR_QUEUE_TIMEOUT": (int, float),
+        "LOOKUP_MAX_WORKERS": int,
+        "CALL_TIMEOUTS": dict,
+        "SINK_MAX_WORKERS": dict,
+        "CIRCUIT_BREAKER_THRESHOLD": int,
+        "CIRCUIT_BREAKER_COOLDOWN": int,
+        "LAG_WATCHDOG_THRESHOLD": (int, float),
+        "PROFILE_CACHE_SIZE": int,
+        "PROFILE_CACHE_TTL": int,
+        "MESSAGE_TEXTS": dict,
+        "PER_PLAYER_LANGUAGE": bool,
+        "COUNTRY_LANGUAGES": dict,
+        "PLAYER_LANGUAGES": dict,
+        "DISCORD_SPOOL_DIR": str,
+        "DISCORD_SPOOL_MAX": int,
+        "OFFICER_VACANCY_DELAY": int,
+        "SHADOW_PROFILES": dict,
+        "SHADOW_REPORT_INTERVAL": int
+    }
+    for name, expected_type in expected_types.items():
+        if not isinstance(getattr(cfg, name, None), expected_type):
+            raise ValueError(f"{name} has an invalid type")
+
+    if not all(
+        isinstance(key, int) and isinstance(value, int)
+        for key, value in cfg.REQUIRED_SUPPORTS.items()
+    ):
+        raise ValueError("REQUIRED_SUPPORTS should only contain integers")
+
     if (
-        not is_recent_abandon(playerclass.lasttime_abandon, watch_interval)
-        or was_alone_in_squad(playerclass, realtime_all)
+        cfg.SEMAPHORE_LIMIT < 1
+        or cfg.EXECUTOR_MAX_WORKERS < 1
+        or cfg.LOOKUP_MAX_WORKERS < 1
+    ):
+        raise ValueError(
+            "SEMAPHORE_LIMIT, EXECUTOR_MAX_WORKERS"
+            " and LOOKUP_MAX_WORKERS should be > 0"
+        )
+
+    if not all(
+        isinstance(value, int) and value > 0
+        for value in cfg.SINK_MAX_WORKERS.values()
     ):
-        return
+        raise ValueError("SINK_MAX_WORKERS should only contain integers > 0")
+    if sum(cfg.SINK_MAX_WORKERS.values()) > cfg.EXECUTOR_MAX_WORKERS:
+        raise ValueError(
+            "SINK_MAX_WORKERS total should not exceed EXECUTOR_MAX_WORKERS"
+        )
 
-    # Get webhook config
-    webhook_url, alerts_enabled = get_discord_webhook_config()
-    if not webhook_url or not alerts_enabled:
-        return
 
-    # Prepare embed
-    embed_desc = (
-        f"Level : {playerclass.actual_level}\n"
-        f"{config.MESSAGE_TEXT.get('nb_squads_abandoned', '(Missing translation)')} : "
-        f"{playerclass.abandons_thismatch}\n"
-        f"{playerclass.known_team}/{playerclass.known_unit_name}/"
-        f"{playerclass.known_role} ➡️ {playerclass.actual_team}"
-        f"/{playerclass.actual_unit_name}/{playerclass.actual_role}"
+# Config settings that can be changed in a shadow profile
+PROFILE_SETTINGS = {
+    "MIN_IMMUNE_LEVEL": "min_immune_level",
+    "ALWAYS_WARN_BAD_OFFICERS": "always_warn_bad_officers",
+    "ALWAYS_SUGGEST_SUPPORT": "always_suggest_support",
+    "REQUIRED_SUPPORTS": "required_supports",
+    "SUPPORT_CANDIDATES_PER_SQUAD": "support_candidates_per_squad"
+}
+
+
+def build_decision_profile(
+    cfg: ModuleType,
+    overrides: Optional[dict] = None
+) -> DecisionProfile:
+    """
+    Build a decision profile from the config,
+    with some settings overridden (shadow profiles).
+    Raises ValueError if an override is invalid.
+    """
+    values = {
+        attribute: getattr(cfg, name)
+        for name, attribute in PROFILE_SETTINGS.items()
+    }
+    for name, value in (overrides or {}).items():
+        if name not in PROFILE_SETTINGS:
+            raise ValueError(f"SHADOW_PROFILES : unknown setting {name}")
+        if type(value) is not type(getattr(cfg, name)):
+            raise ValueError(f"SHADOW_PROFILES : {name} has an invalid type")
+        values[PROFILE_SETTINGS[name]] = value
+    return DecisionProfile(**values)
+
+
+def build_derived_config(
+    cfg: ModuleType
+) -> DerivedConfig:
+    """
+    Validate the config module and precompute the values used on each loop.
+    """
+    validate_config(cfg)
+
+    # MESSAGE_TEXT may be one of MESSAGE_TEXTS or a custom table
+    default_language = next(
+        (
+            language for language, texts in cfg.MESSAGE_TEXTS.items()
+            if texts is cfg.MESSAGE_TEXT
+        ),
+        "default"
     )
+    messages = {
+        language: dict(texts)
+        for language, texts in cfg.MESSAGE_TEXTS.items()
+    }
+    messages[default_language] = dict(cfg.MESSAGE_TEXT)
+
+    webhook_url, alerts_enabled = get_discord_webhook_config(cfg)
+
+    return DerivedConfig(
+        watch_interval=max(30, min(cfg.WATCH_INTERVAL, 60)),
+        semaphore_limit=cfg.SEMAPHORE_LIMIT,
+        default_language=default_language,
+        messages=messages,
+        officer_warnings={
+            language: (
+                texts.get("officer_quitter", '(Missing translation)')
+                + texts.get("nb_squads_abandoned", '(Missing translation)')
+            )
+            for language, texts in messages.items()
+        },
+        webhook_url=webhook_url,
+        alerts_enabled=alerts_enabled,
+        live_profile=build_decision_profile(cfg),
+        shadow_profiles={
+            name: build_decision_profile(cfg, overrides)
+            for name, overrides in cfg.SHADOW_PROFILES.items()
+        }
+    )
+
+
+def load_config(
+    path: str
+) -> tuple[ModuleType, DerivedConfig]:
+    """
+    Execute the config file in a new module object,
+    so the running config is left untouched if the new one is invalid.
+    """
+    spec = importlib.util.spec_from_file_location(config.__name__, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Can't load {path}")
+    new_config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(new_config)
+    return new_config, build_derived_config(new_config)
+
+
+class ConfigWatcher:
+    """
+    Reloads the config file when its mtime changes or on SIGHUP.
+    """
+    def __init__(
+        self,
+        path: str
+    ):
+        self.path = path
+        self.mtime = self._get_mtime()
+        self.reload_requested = False
+
+    def _get_mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return 0.0
+
+    def request_reload(self, signum=None, frame=None) -> None:
+        """
+        Signal handler
+        """
+        self.reload_requested = True
+
+    async def reload_if_changed(self) -> bool:
+        """
+        Load, validate and swap in the new config.
+        Must be called between two polls.
+        Returns True if the config has been swapped.
+        """
+        global config, derived_config
+
+        mtime = self._get_mtime()
+        if mtime == self.mtime and not self.reload_requested:
+            return False
+        self.mtime = mtime
+        self.reload_requested = False
+
+        try:
+            new_config, new_derived_config = await executor.run(
+                "config", load_config, self.path
+            )
+        except Exception as error:  # Any error in the config file
+            logger.error(
+                "Config file changed but couldn't be loaded"
+                " (keeping the old one) : %s",
+                error
+            )
+            return False
+
+        # Swap
+        config = new_config
+        derived_config = new_derived_config
+        sys.modules[config.__name__] = config
+
+        for pool in (executor, lookup_executor):
+            pool.timeouts = config.CALL_TIMEOUTS
+            pool.queue_timeout = config.EXECUTOR_QUEUE_TIMEOUT
+            pool.breaker_threshold = config.CIRCUIT_BREAKER_THRESHOLD
+            pool.breaker_cooldown = config.CIRCUIT_BREAKER_COOLDOWN
+            pool.breakers.clear()
+        player_languages.maxsize = config.PROFILE_CACHE_SIZE
+        discord_spool.max_alerts = config.DISCORD_SPOOL_MAX
+        for cache in (avatar_urls, profile_urls):
+            cache.maxsize = config.PROFILE_CACHE_SIZE
+            cache.ttl = config.PROFILE_CACHE_TTL
+        if (
+            config.EXECUTOR_MAX_WORKERS != executor.max_workers
+            or config.LOOKUP_MAX_WORKERS != lookup_executor.max_workers
+            or config.SINK_MAX_WORKERS != executor.sink_limits
+        ):
+            logger.warning(
+                "EXECUTOR_MAX_WORKERS/LOOKUP_MAX_WORKERS/SINK_MAX_WORKERS"
+                " change requires a restart"
+            )
+        logger.setLevel(get_log_level())
+
+        logger.info("Config file reloaded")
+        return True
+
+
+derived_config = build_derived_config(config)
+
+
+def build_alert_embed(
+    alert: dict
+) -> discord.Embed:
+    """
+    Build the Discord embed from the (serializable) alert data.
+    """
     embed = discord.Embed(
-        title=playerclass.name,
-        url=get_external_profile_url(
-            playerclass.player_id, playerclass.name
-        ),
-        description=embed_desc,
-        color=0xffffff
+        title=alert["name"],
+        url=alert["profile_url"],
+        description=alert["description"],
+        color=0xffffff,
+        timestamp=datetime.fromisoformat(alert["time"])
     )
     embed.set_author(
         name=config.BOT_NAME,
@@ -524,17 +1671,353 @@ async def send_discord_alert_async(
         icon_url=DISCORD_EMBED_AUTHOR_ICON_URL
     )
     embed.set_thumbnail(
-        url=get_avatar_url(playerclass.player_id)
+        url=alert["avatar_url"]
+    )
+    return embed
+
+
+async def send_alert(
+    alert: dict
+) -> None:
+    """
+    Send an alert to the current webhook.
+    Raises an exception if it couldn't be sent.
+    """
+    if not derived_config.webhook_url or not derived_config.alerts_enabled:
+        raise RuntimeError("Discord alerts are disabled")
+    webhook = discord.SyncWebhook.from_url(derived_config.webhook_url)
+    await executor.run(
+        "discord",
+        discord_spool.send_sync, alert["id"], build_alert_embed(alert), webhook
+    )
+    # Sent in time : it won't be spooled
+    discord_spool.forget_sent(alert["id"])
+
+
+# Errors after which an alert is worth sending again later
+# (others, like an invalid webhook or disabled alerts, won't go away)
+RETRYABLE_ALERT_ERRORS = TRANSPORT_ERRORS + (CircuitOpenError, PoolSaturatedError)
+
+
+def is_retryable_alert_error(
+    error: Exception
+) -> bool:
+    """
+    Rate limits are retryable too : discord.py's sync webhook raises
+    a plain HTTPException (status 429) on a Cloudflare ban
+    or when it has run out of retries.
+    """
+    return isinstance(error, RETRYABLE_ALERT_ERRORS) or (
+        isinstance(error, discord.HTTPException)
+        and getattr(error, "status", None) == 429
+    )
+
+
+class DiscordSpool:
+    """
+    Bounded append-only file (one JSON alert per line)
+    holding the alerts that couldn't be sent.
+    A background task replays them, with an exponential backoff.
+    File I/O is done in the executor.
+    The alerts being replayed are never merged when compacting,
+    so a replayed alert can't be merged into a new one and reported again.
+    An alert whose send timed out is spooled, but its worker may still
+    send it : the ids of the alerts sent that way are kept (sent_ids)
+    so they're removed from the spool instead of being replayed.
+    """
+    def __init__(
+        self,
+        max_alerts: int,
+        min_backoff: int = 30,
+        max_backoff: int = 900
+    ):
+        self.max_alerts = max_alerts
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.path: Optional[str] = None
+        self.size = 0
+        self.replaying: set[str] = set()  # ids
+        self.lock = threading.Lock()
+        self.sent_ids: dict[str, None] = {}  # Insertion ordered
+        self.sent_lock = threading.Lock()
+        self.tasks: set[asyncio.Task] = set()
+
+    def send_sync(
+        self,
+        alert_id: str,
+        embed: discord.Embed,
+        webhook: discord.SyncWebhook
+    ) -> None:
+        """
+        Blocking : send the alert, then remember it has been sent,
+        in case its caller has already timed out and spooled it
+        """
+        discord_embed_send(embed, webhook)
+        if self.path is None:
+            return
+        with self.sent_lock:
+            self.sent_ids[alert_id] = None
+            while len(self.sent_ids) > self.max_alerts:
+                del self.sent_ids[next(iter(self.sent_ids))]
+
+    def forget_sent(
+        self,
+        alert_id: str
+    ) -> None:
+        with self.sent_lock:
+            self.sent_ids.pop(alert_id, None)
+
+    def _is_sent(
+        self,
+        alert: dict
+    ) -> bool:
+        with self.sent_lock:
+            return alert["id"] in self.sent_ids
+
+    def _read(self) -> list[dict]:
+        """
+        The spooled alerts, but the ones sent after their caller timed out
+        """
+        try:
+            with open(self.path, encoding="utf-8") as spool_file:
+                alerts = [json.loads(line) for line in spool_file if line.strip()]
+        except FileNotFoundError:
+            return []
+        return [alert for alert in alerts if not self._is_sent(alert)]
+
+    def _write(
+        self,
+        alerts: list[dict]
+    ) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as spool_file:
+            for alert in alerts:
+                spool_file.write(json.dumps(alert) + "\n")
+        os.replace(tmp_path, self.path)
+        self.size = len(alerts)
+
+    def _compact(
+        self,
+        alerts: list[dict]
+    ) -> list[dict]:
+        """
+        Keep the most recent alert of each player
+        (but the ones being replayed).
+        If there are still too many, keep the newest 3/4,
+        so the next appends don't have to compact again.
+        """
+        latest: dict[tuple[str, str], dict] = {}
+        for alert in alerts:
+            if alert["id"] in self.replaying:
+                key = ("id", alert["id"])
+            else:
+                key = ("player", alert["player_id"])
+            merged = latest.pop(key, {}).get("merged", 0)
+            alert["merged"] = merged + alert.get("merged", 1)
+            latest[key] = alert
+        alerts = list(latest.values())
+        if len(alerts) > self.max_alerts:
+            alerts = alerts[-max(1, self.max_alerts * 3 // 4):]
+        return alerts
+
+    def _append_sync(
+        self,
+        alert: dict
+    ) -> None:
+        if self._is_sent(alert):
+            return
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as spool_file:
+                spool_file.write(json.dumps(alert) + "\n")
+            self.size += 1
+            if self.size > self.max_alerts:
+                self._write(self._compact(self._read()))
+
+    def _end_drain_sync(
+        self,
+        done_ids: set[str]
+    ) -> None:
+        """
+        Remove the replayed (or dropped) alerts, then compact if needed
+        """
+        with self.lock:
+            self.replaying.clear()
+            alerts = [
+                alert for alert in self._read() if alert["id"] not in done_ids
+            ]
+            if len(alerts) > self.max_alerts:
+                alerts = self._compact(alerts)
+            self._write(alerts)
+
+    def _load_sync(
+        self,
+        drain: bool = False
+    ) -> list[dict]:
+        with self.lock:
+            alerts = self._read()
+            self.size = len(alerts)
+            if drain:
+                self.replaying = {alert["id"] for alert in alerts}
+            return alerts
+
+    async def _append(
+        self,
+        alert: dict
+    ) -> None:
+        try:
+            await executor.run("spool", self._append_sync, alert)
+        except Exception as error:
+            logger.error(
+                "⚠️ '%s' - Couldn't spool Discord alert : %s",
+                alert["name"],
+                str(error)
+            )
+
+    def add(
+        self,
+        alert: dict
+    ) -> None:
+        """
+        Spool an alert in the background (never waits).
+        """
+        if self.path is None:
+            return
+        task = asyncio.create_task(self._append(alert))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _replay(self) -> bool:
+        """
+        Send the spooled alerts, until one fails.
+        Returns True if none is left.
+        """
+        try:
+            alerts = await executor.run("spool", self._load_sync, True)
+        except Exception as error:
+            logger.error("Couldn't read Discord spool : %s", str(error))
+            return False
+
+        sent_ids = set()
+        dropped_ids = set()
+        for alert in alerts:
+            if self._is_sent(alert):
+                # Sent late, by a worker of a previous attempt
+                sent_ids.add(alert["id"])
+                continue
+            if alert.get("merged", 1) > 1:
+                alert["description"] += (
+                    f"\n({alert['merged']} alerts while Discord was unreachable)"
+                )
+            try:
+                await send_alert(alert)
+            except Exception as error:
+                if is_retryable_alert_error(error):
+                    logger.debug("Discord spool replay failed : %s", str(error))
+                    break
+                logger.warning(
+                    "⚠️ '%s' - Spooled Discord alert dropped : %s",
+                    alert["name"],
+                    str(error)
+                )
+                dropped_ids.add(alert["id"])
+                continue
+            sent_ids.add(alert["id"])
+
+        if sent_ids:
+            logger.info(
+                "Discord spool : %s/%s alerts replayed",
+                len(sent_ids),
+                len(alerts)
+            )
+        try:
+            await executor.run(
+                "spool", self._end_drain_sync, sent_ids | dropped_ids
+            )
+        except Exception as error:
+            self.replaying.clear()
+            logger.error("Couldn't update Discord spool : %s", str(error))
+
+        return len(sent_ids) + len(dropped_ids) == len(alerts)
+
+    async def drain(self) -> None:
+        """
+        Background task : replay the spooled alerts
+        (in _replay(), so they aren't kept in memory between two replays)
+        """
+        backoff = self.min_backoff
+        while True:
+            await asyncio.sleep(backoff)
+            if not self.size:
+                continue
+            if await self._replay():
+                backoff = self.min_backoff
+            else:
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def start(
+        self,
+        path: str
+    ) -> asyncio.Task:
+        """
+        Load the alerts spooled by a previous run and start replaying them.
+        """
+        self.path = path
+        try:
+            await executor.run("spool", self._load_sync)
+        except Exception as error:
+            logger.error("Couldn't read Discord spool : %s", str(error))
+        if self.size:
+            logger.info("Discord spool : %s alerts to replay", self.size)
+        return asyncio.create_task(self.drain())
+
+
+discord_spool = DiscordSpool(config.DISCORD_SPOOL_MAX)
+
+
+async def send_discord_alert_async(
+    playerclass: PlayerData
+) -> None:
+    """
+    Asynchronously send a Discord alert when an officer quits.
+    (see decide_actions())
+    """
+    # Prepare alert
+    messages = derived_config.messages[derived_config.default_language]
+    embed_desc = (
+        f"Level : {playerclass.actual_level}\n"
+        f"{messages.get('nb_squads_abandoned', '(Missing translation)')} : "
+        f"{playerclass.abandons_thismatch}\n"
+        f"{playerclass.known_team}/{playerclass.known_unit_name}/"
+        f"{playerclass.known_role} ➡️ {playerclass.actual_team}"
+        f"/{playerclass.actual_unit_name}/{playerclass.actual_role}"
+    )
+    profile_url, avatar_url = await get_cached_urls(
+        playerclass.player_id, playerclass.name
     )
+    alert = {
+        "id": uuid4().hex,
+        "time": datetime.now(timezone.utc).isoformat(),
+        "player_id": playerclass.player_id,
+        "name": playerclass.name,
+        "profile_url": profile_url,
+        "avatar_url": avatar_url,
+        "description": embed_desc
+    }
 
     # Send embed
     try:
-        webhook = discord.SyncWebhook.from_url(webhook_url)
-        await asyncio.to_thread(
-            discord_embed_send, embed, webhook
-        )
+        await send_alert(alert)
     except Exception as error:
-        logger.warning(
+        if is_retryable_alert_error(error):
+            logger.warning(
+                "⚠️ '%s' (%s) - Couldn't send Discord alert (spooled) : %s",
+                playerclass.name,
+                playerclass.actual_level,
+                str(error)
+            )
+            discord_spool.add(alert)
+            return
+        logger.error(
             "⚠️ '%s' (%s) - Couldn't send Discord alert : %s",
             playerclass.name,
             playerclass.actual_level,
@@ -542,39 +2025,146 @@ async def send_discord_alert_async(
         )
 
 
+class ShadowEvaluator:
+    """
+    Counts the messages and alerts that the shadow profiles would send,
+    using the same decisions as the live ones, without sending anything.
+    Facts shared by all the profiles (abandons, squads, team roles)
+    are computed once per poll.
+    """
+    def __init__(self):
+        self.totals: dict[str, Counter] = {}
+        self.polls = 0
+        self.last_report = monotonic()
+
+    def evaluate(
+        self,
+        changed_players: list[PlayerData],
+        snapshot: Optional[PlayersSnapshot]
+    ) -> None:
+        """
+        Evaluate the live profile and each shadow profile on this poll
+        (after decide_actions() has set the players' 'abandoned' flag)
+        No snapshot is needed if nobody changed role.
+        """
+        self.polls += 1
+        if not changed_players:
+            return
+        profiles = {"(live)": derived_config.live_profile}
+        profiles.update(derived_config.shadow_profiles)
+
+        for name, profile in profiles.items():
+            support_candidates = select_support_candidates(
+                snapshot.team_counts,
+                snapshot.squads_without_support,
+                changed_players,
+                profile
+            )
+            totals = self.totals.setdefault(name, Counter())
+            for playerclass in changed_players:
+                warn_officer, suggest_support, guide_role = decide_message(
+                    playerclass,
+                    profile,
+                    playerclass.player_id in support_candidates
+                )
+                totals["rcon_messages"] += (
+                    warn_officer or suggest_support or guide_role
+                )
+                totals["officer_warnings"] += warn_officer
+                totals["support_suggestions"] += suggest_support
+                totals["role_guidances"] += guide_role
+                totals["discord_alerts"] += decide_alert(playerclass)
+
+    def log_report(self) -> None:
+        """
+        Log the totals every config.SHADOW_REPORT_INTERVAL minutes
+        """
+        if (
+            not self.totals
+            or monotonic() - self.last_report < config.SHADOW_REPORT_INTERVAL * 60
+        ):
+            return
+        self.last_report = monotonic()
+        for name, totals in self.totals.items():
+            logger.info(
+                "Shadow profile '%s' (%s polls) : %s",
+                name,
+                self.polls,
+                ", ".join(
+                    f"{key}={totals[key]}"
+                    for key in (
+                        "rcon_messages", "officer_warnings",
+                        "support_suggestions", "role_guidances",
+                        "discord_alerts"
+                    )
+                )
+            )
+
+
+shadow_evaluator = ShadowEvaluator()
+
+
 async def track_role_changes_async() -> None:
     """
     Main function to track role changes and send messages and alerts.
     'realtime_all' dict : realtime players data
     'known_all' dict : players data as it was at the end of last loop
     """
-    watch_interval = max(30, min(config.WATCH_INTERVAL, 60))
+    watch_interval = derived_config.watch_interval
     rcon = Rcon(SERVER_INFO)
     known_all: dict[str, dict[str, Any]] = {}
-    semaphore = asyncio.Semaphore(config.SEMAPHORE_LIMIT)
+    known_all_size = 0
+    semaphore = asyncio.Semaphore(derived_config.semaphore_limit)
+    vacancies = TimerWheel(tick=10)
+    reminded_squads: set[tuple[str, str]] = set()
+
+    config_watcher = ConfigWatcher(config.__file__)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, config_watcher.request_reload)
+
+    if config.LAG_WATCHDOG_THRESHOLD > 0:
+        watchdog.start()
+
+    spool_task = await discord_spool.start(  # Keep a reference
+        os.path.join(
+            config.DISCORD_SPOOL_DIR,
+            f"watch_roles_discord_spool_{get_server_number()}.jsonl"
+        )
+    )
 
     while True:  # Infinite loop
 
+        # Swap config between polls (known_all is kept)
+        watchdog.phase = "config reload"
+        if await config_watcher.reload_if_changed():
+            watch_interval = derived_config.watch_interval
+            semaphore = asyncio.Semaphore(derived_config.semaphore_limit)
+            if config.LAG_WATCHDOG_THRESHOLD > 0:
+                watchdog.start()
+
         now_dt = datetime.now(timezone.utc)
 
+        watchdog.phase = "clean_old_entries"
         known_all = clean_old_entries(now_dt, known_all)
+        watchdog.phase = "reset_on_match_end"
         known_all = await reset_on_match_end(now_dt, known_all, watch_interval)
 
+        watchdog.phase = "get_detailed_players"
         try:
-            realtime_all = await asyncio.to_thread(rcon.get_detailed_players)
+            realtime_all = await executor.run(
+                "rcon_poll",
+                rcon.get_detailed_players
+            )
         except Exception as error:
             logger.error("get_detailed_players() failed: %s", str(error))
             await asyncio.sleep(watch_interval)
             continue
 
+        watchdog.phase = "clean_departed_players"
         known_all = clean_departed_players(realtime_all, known_all)
 
-        (
-            allies_supports_needed,
-            axis_supports_needed
-        ) = is_support_needed(realtime_all)
-
-        tasks = []
+        watchdog.phase = "players"
+        changed_players: list[PlayerData] = []
 
         for realtime_player in realtime_all["players"].values():
 
@@ -600,6 +2190,14 @@ async def track_role_changes_async() -> None:
             actual_unit = realtime_player['unit_name']
             actual_role = realtime_player['role']
 
+            # Messages won't wait for this.
+            # Retried on each poll until the lookup succeeds
+            # (no-op if cached or pending)
+            if config.PER_PLAYER_LANGUAGE:
+                player_languages.prefetch(
+                    player_id, lookup_player_language, player_id
+                )
+
             # (new player) Create entry in 'known_all'
             if player_id not in known_all:
                 known_all[player_id] = {
@@ -620,9 +2218,13 @@ async def track_role_changes_async() -> None:
                     actual_unit,
                     actual_role
                 )
-                logger.debug(
-                    "'known_all' dict now contains %s entries", len(known_all)
-                )
+                # Alerts won't wait for these
+                if derived_config.webhook_url and derived_config.alerts_enabled:
+                    profile_urls.prefetch(
+                        (player_id, name),
+                        get_external_profile_url, player_id, name
+                    )
+                    avatar_urls.prefetch(player_id, get_avatar_url, player_id)
                 continue  # We'll check for changes on next loop
 
             # Get historical data from 'known_all'
@@ -647,21 +2249,27 @@ async def track_role_changes_async() -> None:
                 or known_unit_name != actual_unit
                 or known_role != actual_role
             ):
-                common_change_str = (
-                    f"'{name}' ({actual_level})"
-                    f" - {known_team}/{known_unit_name}/{known_role}"
-                    f" ➡️ {actual_team}/{actual_unit}/{actual_role}"
+                # Formatted by the log listener, if the log level allows it
+                change_args = (
+                    name, actual_level,
+                    known_team, known_unit_name, known_role,
+                    actual_team, actual_unit, actual_role
                 )
 
                 # The player was an officer
                 if known_role in OFFICERS:
                     abandons_thismatch += 1
                     lasttime_abandon = now_dt
-                    logger.info("🟥x%s %s", abandons_thismatch, common_change_str)
+                    logger.info(
+                        "🟥x%s '%s' (%s) - %s/%s/%s ➡️ %s/%s/%s",
+                        abandons_thismatch, *change_args
+                    )
 
                 # The player wasn't an officer
                 else:
-                    logger.debug("🟩 %s", common_change_str)
+                    logger.debug(
+                        "🟩 '%s' (%s) - %s/%s/%s ➡️ %s/%s/%s", *change_args
+                    )
 
                 # Create a player dataclass to be used in functions
                 playerclass = PlayerData(
@@ -675,9 +2283,7 @@ async def track_role_changes_async() -> None:
                     actual_unit_name = actual_unit,
                     actual_role = actual_role,
                     abandons_thismatch = abandons_thismatch,
-                    lasttime_abandon = lasttime_abandon,
-                    allies_supports_needed = allies_supports_needed,
-                    axis_supports_needed = axis_supports_needed
+                    lasttime_abandon = lasttime_abandon
                 )
 
                 known_player.update(
@@ -691,28 +2297,93 @@ async def track_role_changes_async() -> None:
                     }
                 )
 
-                # Queue ingame messages
-                tasks.append(
-                    limited_task(
-                        semaphore,
-                        send_message_async,
-                        rcon, playerclass, realtime_all, watch_interval
-                    )
+                changed_players.append(playerclass)
+
+        # Most polls have nothing to decide
+        snapshot: Optional[PlayersSnapshot] = None
+        if changed_players or config.OFFICER_VACANCY_DELAY > 0:
+            watchdog.phase = "snapshot"
+            snapshot = PlayersSnapshot(realtime_all)
+
+        watchdog.phase = "officer vacancies"
+        if config.OFFICER_VACANCY_DELAY > 0:
+            vacant_squads = update_officer_vacancies(
+                vacancies, reminded_squads, snapshot, monotonic()
+            )
+        else:
+            vacancies.clear()
+            reminded_squads.clear()
+            vacant_squads = []
+
+        messages, alerts = [], []
+        if changed_players:
+            watchdog.phase = "decisions"
+            messages, alerts = decide_actions(
+                snapshot, changed_players, watch_interval
+            )
+
+        if derived_config.shadow_profiles:
+            watchdog.phase = "shadow profiles"
+            shadow_evaluator.evaluate(changed_players, snapshot)
+
+        tasks = []
+
+        # Queue ingame messages
+        for playerclass, msg in messages:
+            tasks.append(
+                limited_task(
+                    semaphore,
+                    send_message_async,
+                    rcon, playerclass, msg
                 )
-                # Queue Discord alerts
+            )
+
+        # Queue Discord alerts
+        for playerclass in alerts:
+            tasks.append(
+                limited_task(
+                    semaphore,
+                    send_discord_alert_async,
+                    playerclass
+                )
+            )
+
+        # Queue squads without officer messages
+        for squad, members in vacant_squads:
+            logger.info(
+                "🟧 %s/%s - no officer since %s s",
+                squad[0],
+                squad[1],
+                config.OFFICER_VACANCY_DELAY
+            )
+            for realtime_player in members:
                 tasks.append(
                     limited_task(
                         semaphore,
-                        send_discord_alert_async,
-                        playerclass, realtime_all, watch_interval
+                        send_vacancy_message_async,
+                        rcon, realtime_player
                     )
                 )
 
         # Send messages and alerts
+        watchdog.phase = "messages and alerts"
         if tasks:
             await asyncio.gather(*tasks)
 
+        if len(known_all) != known_all_size:
+            known_all_size = len(known_all)
+            logger.debug(
+                "'known_all' dict now contains %s entries", known_all_size
+            )
+
+        executor.log_stats()
+        lookup_executor.log_stats()
+        watchdog.log_stats()
+
+        shadow_evaluator.log_report()
+
         # Wait before the next check
+        watchdog.phase = "idle"
         await asyncio.sleep(watch_interval)
 
 
@@ -32,11 +32,23 @@ ALWAYS_WARN_BAD_OFFICERS = True
 # {1:1, 2:1, 3:2} means "1 infantry squad: 1 support, 2 infantry squads: 1 support, 3 infantry squads: 2 supports"
 REQUIRED_SUPPORTS = {0:0, 1:1, 2:1, 3:2, 4:2, 5:3, 6:3, 7:4, 8:4, 9:5, 10:5, 11:6, 12:6}
 
+# How many players of each squad lacking a support will get the suggestion
+# (the biggest squads are chosen first, one squad per missing support)
+# Default : 1
+SUPPORT_CANDIDATES_PER_SQUAD = 1
+
 # Always suggest players about taking support role (whatever their level)
 # (they'll always be informed if their level is below MIN_IMMUNE_LEVEL)
 # Default : True
 ALWAYS_SUGGEST_SUPPORT = True
 
+# Ask the members of a squad (2+ players) to take the officer role
+# when nobody has played it for X seconds (once per vacancy,
+# players above MIN_IMMUNE_LEVEL won't get the message)
+# Disable : 0
+# Default : 180
+OFFICER_VACANCY_DELAY = 180
+
 # Dedicated Discord's channel webhook
 # (the script can work without any Discord output)
 # ["https://discord.com/api/webhooks/...", True] = enabled
@@ -55,6 +67,17 @@ SERVER_CONFIG = [
 ]
 
 
+# Shadow mode : count how many messages and alerts other settings would send
+# (nothing is sent : results are logged every SHADOW_REPORT_INTERVAL minutes)
+# Available settings : MIN_IMMUNE_LEVEL, ALWAYS_WARN_BAD_OFFICERS,
+#   ALWAYS_SUGGEST_SUPPORT, REQUIRED_SUPPORTS, SUPPORT_CANDIDATES_PER_SQUAD
+# ie : {"level 30": {"MIN_IMMUNE_LEVEL": 30}, "lenient": {"ALWAYS_WARN_BAD_OFFICERS": False}}
+# Disable : {}
+# Default : {}
+SHADOW_PROFILES = {}
+SHADOW_REPORT_INTERVAL = 60
+
+
 # The texts below are displayed to the player.
 # (Check for the next setting to set the language you want to use)
 
@@ -63,6 +86,7 @@ MESSAGE_TEXT_FR = {
     "officer_quitter": "Tu as quitté ton poste d'officier,\nabandonnant tes hommes.\nCe comportement n'est pas acceptable.\n",
     "nb_squads_abandoned": "Nombre de squads abandonnées",
     "support_needed": "Ton équipe manque de Soutiens !\nEn jouant ce rôle, tu pourrais aider ton SL à poser des garnies !\n----------\n",
+    "officer_vacancy": "Ton escouade n'a plus d'officier !\nSans lui, pas de garnies ni d'AP.\nL'un de vous doit prendre le rôle.",
     # Officers
     "armycommander": "Tu as choisi de jouer\n- Commandant -\n\nTu DOIS communiquer en vocal.\nSi tu ne peux/veux pas :\ncède ta place !\n----------\nDemande aux officiers de poser des garnies\net aux ingénieurs de construire des nodes dès qu'ils le peuvent.",
     "officer": "Tu as choisi de jouer\n- Squad Leader (SL) -\n\nTu DOIS communiquer en vocal.\nSi tu ne peux/veux pas :\ncède ta place !\n----------\nPose des garnies à 200m des points et ton AP à 100m.\nInforme le commandant de tes actions et exécute ses ordres.",
@@ -89,6 +113,7 @@ MESSAGE_TEXT_EN = {
     "officer_quitter": "You have left your officer role,\nabandoning your men.\nThis behavior is unacceptable.\n",
     "nb_squads_abandoned": "Number of abandoned squads",
     "support_needed": "Your team needs more Supports !\nPlaying this role, you would help to build garrisons!\n----------\n",
+    "officer_vacancy": "Your squad has no officer !\nWithout one, no garrisons nor OPs can be built.\nOne of you should take the role.",
     # Officers
     "armycommander": "You chose to play\n- Commander -\n\nYou MUST communicate via voice chat.\nIf you can't or won't: give up your spot!\n----------\nAsk officers to place garrisons and engineers to build nodes as soon as possible.",
     "officer": "You chose to play\n- Squad Leader (SL) -\n\nYou MUST communicate via voice chat.\nIf you can't or won't: give up your spot!\n----------\nPlace garrisons 200m from objectives and your OP 100m away.\nInform the commander of your actions and follow orders.",
@@ -115,6 +140,7 @@ MESSAGE_TEXT_ES = {
     "officer_quitter": "Has abandonado tu rol de oficial,\nabandonando a tus hombres.\nEste comportamiento es inaceptable.\n",
     "nb_squads_abandoned": "Número de escuadras abandonadas",
     "support_needed": "¡Tu equipo necesita más apoyos!\nJugando este rol ayudarías a construir guarniciones.\n----------\n",
+    "officer_vacancy": "¡Tu escuadra no tiene oficial!\nSin él, no se pueden construir guarniciones ni OPs.\nUno de vosotros debería tomar el rol.",
     # Officers
     "armycommander": "Has elegido jugar como\n- Comandante -\n\nDEBES comunicarte por chat de voz.\nSi no puedes o no quieres: ¡cede tu puesto!\n----------\nPide a los oficiales que coloquen guarniciones y a los ingenieros que construyan nodos lo antes posible.",
     "officer": "Has elegido jugar como\n- Líder de escuadra (SL) -\n\nDEBES comunicarte por chat de voz.\nSi no puedes o no quieres: ¡cede tu puesto!\n----------\nColoca guarniciones a 200m de los objetivos y tu OP a 100m.\nInforma al comandante de tus acciones y sigue órdenes.",
@@ -141,6 +167,7 @@ MESSAGE_TEXT_DE = {
     "officer_quitter": "Du hast deine Offiziersrolle verlassen\nund deine Männer im Stich gelassen.\nDieses Verhalten ist inakzeptabel.\n",
     "nb_squads_abandoned": "Anzahl der verlassenen Trupps",
     "support_needed": "Dein Team braucht mehr Unterstützer!\nIn dieser Rolle könntest du beim Bau von Garnisonen helfen!\n----------\n",
+    "officer_vacancy": "Dein Trupp hat keinen Offizier!\nOhne ihn können keine Garnisonen oder OPs gebaut werden.\nEiner von euch sollte die Rolle übernehmen.",
     # Officers
     "armycommander": "Du hast gewählt zu spielen als\n- Kommandant -\n\nDU MUSST über Voice-Chat kommunizieren.\nWenn du nicht kannst oder willst: Gib deinen Platz frei!\n----------\nBitte die Offiziere, Garnisonen zu platzieren, und Ingenieure, so schnell wie möglich Versorgungsknoten zu bauen.",
     "officer": "Du hast gewählt zu spielen als\n- Truppführer (SL) -\n\nDU MUSST über Voice-Chat kommunizieren.\nWenn du nicht kannst oder willst: Gib deinen Platz frei!\n----------\nPlatziere Garnisonen 200 m vom Ziel entfernt und dein OP 100 m entfernt.\nInformiere den Kommandanten über deine Aktionen und folge seinen Befehlen.",
@@ -170,13 +197,44 @@ MESSAGE_TEXT = MESSAGE_TEXT_EN
 # MESSAGE_TEXT = MESSAGE_TEXT_ES
 # MESSAGE_TEXT = MESSAGE_TEXT_DE
 
+# Send the messages in the player's language, if available
+# (players whose language can't be found will get MESSAGE_TEXT, as set above)
+# Default : True
+PER_PLAYER_LANGUAGE = True
+
+# Players' language, guessed from their (Steam) country
+COUNTRY_LANGUAGES = {
+    "FR": "fr", "BE": "fr", "LU": "fr", "MC": "fr",
+    "GB": "en", "IE": "en", "US": "en", "CA": "en", "AU": "en", "NZ": "en",
+    "ES": "es", "MX": "es", "AR": "es", "CL": "es", "CO": "es", "PE": "es", "VE": "es", "UY": "es",
+    "DE": "de", "AT": "de", "CH": "de", "LI": "de"
+}
+
+# Players' language preferences (overrides their country)
+# ie : {"76561198012345678": "fr", "76561198087654321": "de"}
+PLAYER_LANGUAGES = {}
+
 
 # You shouldn't edit anything below this line
 # -------------------------------------------------------------------------------------------------
 
+# Available languages
+MESSAGE_TEXTS = {
+    "fr": MESSAGE_TEXT_FR,
+    "en": MESSAGE_TEXT_EN,
+    "es": MESSAGE_TEXT_ES,
+    "de": MESSAGE_TEXT_DE
+}
+
 # Bot name that will be displayed in logs and Discord messages
 BOT_NAME = "custom_tools_watch_roles"
 
+# Logging level : "DEBUG", "INFO", "WARNING" or "ERROR"
+# (can be overridden by the WATCH_ROLES_LOG_LEVEL environment variable)
+# "DEBUG" logs every role change
+# Default : "INFO"
+LOG_LEVEL = "INFO"
+
 # Autocleaning
 # Unfollow players who didn't change role since X minutes
 # Default : 90
@@ -185,3 +243,61 @@ AUTO_CLEANING_TIME = 90
 # Limit threading concurrency
 # Default : 10
 SEMAPHORE_LIMIT = 10
+
+# Dedicated thread pool for blocking RCON/Discord calls
+# Should be higher than SEMAPHORE_LIMIT
+# Default : 16
+EXECUTOR_MAX_WORKERS = 16
+
+# Maximum number of workers each kind of blocking call can use
+# (including the calls that timed out but are still running),
+# so a hung RCON/Discord can't take the workers of the others
+# The total must not exceed EXECUTOR_MAX_WORKERS
+# Unlisted : 1
+# Default : {"rcon_poll": 2, "rcon_message": 9, "logs": 1, "discord": 2, "config": 1, "spool": 1}
+SINK_MAX_WORKERS = {"rcon_poll": 2, "rcon_message": 9, "logs": 1, "discord": 2, "config": 1, "spool": 1}
+
+# Separate thread pool for players profiles lookups
+# (languages, Discord avatars and profiles urls)
+# Default : 6
+LOOKUP_MAX_WORKERS = 6
+
+# When all the workers (of the pool or of its kind) are busy,
+# a call waits up to X seconds for a free one
+# then is dropped (the message isn't sent, the poll is skipped)
+# Default : 5
+EXECUTOR_QUEUE_TIMEOUT = 5
+
+# Blocking calls timeouts (in seconds)
+# rcon_poll : players list ; rcon_message : messages to players
+# A call that doesn't return in time is abandoned and counted as a failure
+# Default : {"rcon_poll": 10, "rcon_message": 10, "logs": 10, "discord": 15}
+CALL_TIMEOUTS = {"rcon_poll": 10, "rcon_message": 10, "logs": 10, "discord": 15}
+
+# Circuit breaker
+# After X consecutive failures (timeouts or connection errors),
+# calls to the failing sink (rcon_poll/rcon_message/logs/discord)
+# are skipped for Y seconds, then a single call is made to test it
+# Default : 3 failures, 60 seconds
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_COOLDOWN = 60
+
+# Event loop lag watchdog
+# Logs what the bot was doing when its main loop was blocked for more than X seconds
+# Disable : 0
+# Default : 1
+LAG_WATCHDOG_THRESHOLD = 1
+
+# Discord alerts : players avatars and profiles urls cache
+# Size : number of players ; TTL : seconds
+# Default : 500 players, 3600 seconds
+PROFILE_CACHE_SIZE = 500
+PROFILE_CACHE_TTL = 3600
+
+# Discord alerts that couldn't be sent are saved in this folder
+# and sent later, when Discord is reachable again
+# If there are more than X alerts, only the last one of each player is kept
+# (then, if there are still too many, the newest 3/4)
+# Default : "/logs", 200
+DISCORD_SPOOL_DIR = "/logs"
+DISCORD_SPOOL_MAX = 200
@@ -0,0 +1,245 @@
+"""
+bench_decisions.py
+
+Benchmark : the single decision pass of a poll
+(PlayersSnapshot + decide_actions()) against the per-player evaluation
+it replaced, where each changed player rescanned the whole snapshot
+and the dispatchers ran the abandon check again.
+Both are first checked to take the same decisions.
+
+Run : python tests/bench_decisions.py
+"""
+
+import dataclasses
+from datetime import datetime, timezone
+import random
+import statistics
+import time
+
+import stubs
+
+stubs.install()
+
+from custom_tools import watch_roles  # noqa: E402
+from custom_tools.watch_roles import (  # noqa: E402
+    OFFICERS,
+    PlayerData,
+    PlayersSnapshot,
+    decide_actions,
+    decide_alert,
+    decide_message,
+    is_recent_abandon,
+    render_message,
+    select_support_candidates
+)
+
+WATCH_INTERVAL = 30
+ROLES = (
+    "officer", "rifleman", "assault", "medic", "support", "engineer",
+    "antitank", "automaticrifleman", "spotter", "sniper", "tankcommander",
+    "crewman", "armycommander"
+)
+UNITS = (
+    "able", "baker", "charlie", "dog", "easy", "fox", "george", "how",
+    "item", "jig", None, "command", "unassigned"
+)
+CASES = ((100, 5), (100, 30), (100, 100))  # (players, changed players)
+RUNS = 2000
+
+
+# Per-player evaluation (before the single decision pass)
+
+def count_team_roles(realtime_all: dict) -> dict[str, dict[str, int]]:
+    counts = {
+        "allies": {"officer": 0, "support": 0},
+        "axis": {"officer": 0, "support": 0}
+    }
+    for realtime_player in realtime_all["players"].values():
+        team = realtime_player.get("team")
+        role = realtime_player.get("role")
+        if team in counts and role in counts[team]:
+            counts[team][role] += 1
+    return counts
+
+
+def get_squads_without_support(
+    realtime_all: dict
+) -> dict[tuple[str, str], int]:
+    squads_sizes: dict[tuple[str, str], int] = {}
+    squads_with_support = set()
+    for realtime_player in realtime_all.get("players", {}).values():
+        unit = realtime_player.get("unit_name")
+        if not unit or unit in ("unassigned", "command"):
+            continue
+        squad = (realtime_player.get("team"), unit)
+        squads_sizes[squad] = squads_sizes.get(squad, 0) + 1
+        if realtime_player.get("role") == "support":
+            squads_with_support.add(squad)
+    return {
+        squad: size
+        for squad, size in squads_sizes.items()
+        if squad not in squads_with_support
+    }
+
+
+def was_alone_in_squad(playerclass: PlayerData, realtime_all: dict) -> bool:
+    if not playerclass.known_unit_name:
+        return True
+    if playerclass.known_unit_name == "command":
+        return False
+    for realtime_player in realtime_all.get("players", {}).values():
+        unit = realtime_player["unit_name"]
+        if (
+            realtime_player["player_id"] == playerclass.player_id
+            or not unit
+            or unit == "command"
+        ):
+            continue
+        if (
+            realtime_player["team"] == playerclass.known_team
+            and unit == playerclass.known_unit_name
+        ):
+            return False
+    return True
+
+
+def is_officer_abandon(playerclass: PlayerData, realtime_all: dict) -> bool:
+    return (
+        is_recent_abandon(playerclass.lasttime_abandon, WATCH_INTERVAL)
+        and not was_alone_in_squad(playerclass, realtime_all)
+    )
+
+
+def per_player_pass(realtime_all: dict, changed_players: list) -> tuple:
+    profile = watch_roles.derived_config.live_profile
+    for playerclass in changed_players:
+        playerclass.abandoned = is_officer_abandon(playerclass, realtime_all)
+    support_candidates = select_support_candidates(
+        count_team_roles(realtime_all),
+        get_squads_without_support(realtime_all),
+        changed_players,
+        profile
+    )
+    messages = []
+    alerts = []
+    for playerclass in changed_players:
+        # send_message_async() and send_discord_alert_async()
+        # each checked the abandon again
+        playerclass.abandoned = is_officer_abandon(playerclass, realtime_all)
+        msg = render_message(
+            playerclass,
+            *decide_message(
+                playerclass,
+                profile,
+                playerclass.player_id in support_candidates
+            )
+        )
+        if msg:
+            messages.append((playerclass, msg))
+        playerclass.abandoned = is_officer_abandon(playerclass, realtime_all)
+        if decide_alert(playerclass):
+            alerts.append(playerclass)
+    return messages, alerts
+
+
+def batch_pass(realtime_all: dict, changed_players: list) -> tuple:
+    return decide_actions(
+        PlayersSnapshot(realtime_all), changed_players, WATCH_INTERVAL
+    )
+
+
+# Random data
+
+def make_snapshot(rng: random.Random, players: int) -> dict:
+    return {
+        "players": {
+            str(index): {
+                "player_id": str(index),
+                "name": f"player{index}",
+                "level": rng.randint(1, 300),
+                "team": rng.choice(("allies", "axis")),
+                "unit_name": rng.choice(UNITS),
+                "role": rng.choice(ROLES)
+            }
+            for index in range(players)
+        }
+    }
+
+
+def make_changed_players(
+    rng: random.Random,
+    realtime_all: dict,
+    count: int
+) -> list[PlayerData]:
+    now = datetime.now(timezone.utc)
+    changed_players = []
+    for realtime_player in rng.sample(
+        list(realtime_all["players"].values()), count
+    ):
+        known_role = rng.choice(ROLES)
+        changed_players.append(PlayerData(
+            realtime_player["player_id"],
+            realtime_player["name"],
+            realtime_player["level"],
+            rng.choice(("allies", "axis")),
+            rng.choice(UNITS),
+            known_role,
+            realtime_player["team"],
+            realtime_player["unit_name"],
+            realtime_player["role"],
+            1,
+            now if known_role in OFFICERS and rng.random() < 0.5 else None
+        ))
+    return changed_players
+
+
+def decisions(result: tuple) -> tuple:
+    messages, alerts = result
+    return (
+        [(playerclass.player_id, msg) for playerclass, msg in messages],
+        [playerclass.player_id for playerclass in alerts]
+    )
+
+
+def check_same_decisions(rng: random.Random, snapshots: int = 300) -> None:
+    for _ in range(snapshots):
+        realtime_all = make_snapshot(rng, 100)
+        changed_players = make_changed_players(rng, realtime_all, 30)
+        assert decisions(per_player_pass(realtime_all, changed_players)) == (
+            decisions(batch_pass(realtime_all, changed_players))
+        )
+    print(f"Same decisions on {snapshots} random snapshots")
+
+
+def median_us(func, realtime_all: dict, changed_players: list) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func(realtime_all, changed_players)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main() -> None:
+    # Alerts count as decisions too
+    watch_roles.derived_config = dataclasses.replace(
+        watch_roles.derived_config,
+        webhook_url="https://discord.com/api/webhooks/1/bench",
+        alerts_enabled=True
+    )
+    rng = random.Random(3)
+    check_same_decisions(rng)
+
+    print(f"{'players':>8}{'changed':>9}{'per-player':>13}{'batch':>10}")
+    for players, changed in CASES:
+        realtime_all = make_snapshot(rng, players)
+        changed_players = make_changed_players(rng, realtime_all, changed)
+        print(
+            f"{players:>8}{changed:>9}"
+            f"{median_us(per_player_pass, realtime_all, changed_players):>10.0f} us"
+            f"{median_us(batch_pass, realtime_all, changed_players):>7.0f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Runs before the tests modules are imported : see stubs.py
+"""
+
+import stubs
+
+stubs.install()
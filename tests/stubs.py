@@ -0,0 +1,115 @@
+"""
+stubs.py
+
+Minimal stand-ins for the CRCON modules (rcon, discord, common_functions)
+so watch_roles can be imported outside of a CRCON install.
+Tests and benchmarks replace the functions they need on the imported module.
+"""
+
+import os
+import sys
+from types import ModuleType
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _module(
+    name: str,
+    **attributes
+) -> ModuleType:
+    module = ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules.setdefault(name, module)
+    return sys.modules[name]
+
+
+class Rcon:
+    """
+    Replaced by the tests (see watch_roles.track_role_changes_async)
+    """
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get_detailed_players(self) -> dict:
+        return {"players": {}}
+
+    def message_player(self, **kwargs) -> None:
+        pass
+
+
+class DiscordException(Exception):
+    pass
+
+
+class HTTPException(DiscordException):
+    pass
+
+
+class DiscordServerError(HTTPException):
+    pass
+
+
+class NotFound(HTTPException):
+    pass
+
+
+class Embed:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.timestamp = kwargs.get("timestamp")
+
+    def set_author(self, **kwargs) -> None:
+        pass
+
+    def set_thumbnail(self, **kwargs) -> None:
+        pass
+
+
+class SyncWebhook:
+    @staticmethod
+    def from_url(url: str) -> str:
+        return url
+
+
+def install() -> None:
+    """
+    Register the stubs, then make 'custom_tools' importable.
+    Does nothing for the modules that are really installed.
+    """
+    _module("rcon")
+    _module("rcon.game_logs", get_recent_logs=lambda **kwargs: {"logs": []})
+    _module(
+        "rcon.player_history",
+        get_player_profile=lambda player_id, nb_sessions: {}
+    )
+    _module("rcon.rcon", Rcon=Rcon)
+    _module("rcon.settings", SERVER_INFO={})
+    _module("rcon.utils", get_server_number=lambda: "1")
+    _module(
+        "discord",
+        DiscordException=DiscordException,
+        HTTPException=HTTPException,
+        DiscordServerError=DiscordServerError,
+        NotFound=NotFound,
+        Embed=Embed,
+        SyncWebhook=SyncWebhook
+    )
+    _module(
+        "custom_tools.common_functions",
+        DISCORD_EMBED_AUTHOR_URL="https://github.com/ElGuillermo",
+        DISCORD_EMBED_AUTHOR_ICON_URL="https://github.com/ElGuillermo.png",
+        SUPPORT_CANDIDATES={
+            "rifleman", "assault", "automaticrifleman", "medic",
+            "engineer", "antitank", "heavymachinegunner"
+        },
+        OFFICERS={"armycommander", "officer", "tankcommander", "spotter"},
+        get_external_profile_url=lambda player_id, name: (
+            f"https://example.com/profile/{player_id}"
+        ),
+        get_avatar_url=lambda player_id: (
+            f"https://example.com/avatar/{player_id}.png"
+        ),
+        discord_embed_send=lambda embed, webhook: None
+    )
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
@@ -0,0 +1,430 @@
+"""
+test_watch_roles_memory.py
+
+Soak test : drives track_role_changes_async() through simulated days
+(players joining, changing squad/role and leaving, match cycles,
+a Discord outage) on a fake clock, and checks that memory stays bounded.
+The peak size of each component is printed at the end.
+
+Run : python -m pytest tests (2 simulated days, about a minute)
+Full week (a few minutes) : WATCH_ROLES_SOAK_DAYS=7 python -m pytest tests
+"""
+
+import asyncio
+from collections import deque
+import dataclasses
+from datetime import datetime, timezone
+import gc
+import logging
+import os
+import random
+import sys
+import tracemalloc
+
+from custom_tools import watch_roles
+
+DAYS = float(os.getenv("WATCH_ROLES_SOAK_DAYS", "2"))
+START = datetime(2026, 1, 5, tzinfo=timezone.utc).timestamp()  # A monday
+SAMPLE_INTERVAL = 3600  # Simulated seconds between two memory samples
+MATCH_DURATION = 90 * 60
+PEAK_PLAYERS = 100  # From 12:00 to 01:00
+OFF_PEAK_PLAYERS = 30
+DISCORD_OUTAGE = (START + 18 * 3600, START + 23 * 3600)  # Day 1, 18:00-23:00
+
+TEAMS = ("allies", "axis")
+UNITS = ("able", "baker", "charlie", "dog", "easy", "fox", "command", None)
+ROLES = (
+    "officer", "rifleman", "assault", "automaticrifleman", "medic",
+    "support", "engineer", "antitank", "armycommander"
+)
+COUNTRIES = ("FR", "DE", "US", "ES", None)
+
+REAL_SLEEP = asyncio.sleep
+
+
+class SoakFinished(BaseException):
+    """
+    Raised in the main loop when the simulated time is over
+    """
+
+
+class SimClock:
+    """
+    Simulated time : the main loop's sleeps move it forward,
+    the background tasks' sleeps wait for it.
+    """
+    def __init__(
+        self,
+        start: float,
+        end: float,
+        on_tick
+    ):
+        self.now = start
+        self.end = end
+        self.on_tick = on_tick
+        self.main_task = None
+        self.ticked = asyncio.Event()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(
+        self,
+        delay: float,
+        result=None
+    ):
+        if asyncio.current_task() is self.main_task:
+            self.on_tick()
+            if self.now >= self.end:
+                raise SoakFinished
+            self.now += max(delay, 0)
+            ticked, self.ticked = self.ticked, asyncio.Event()
+            ticked.set()
+            await REAL_SLEEP(0)
+            return result
+
+        deadline = self.now + delay
+        await REAL_SLEEP(0)
+        while self.now < deadline:
+            await self.ticked.wait()
+        return result
+
+
+class SimServer:
+    """
+    Game server : players join, change squad/role and leave,
+    a match ends every MATCH_DURATION seconds.
+    Called from the executor threads.
+    """
+    def __init__(
+        self,
+        clock: SimClock,
+        seed: int = 1
+    ):
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.online: dict[str, dict] = {}
+        self.unique_players = 0
+        self.max_online = 0
+        self.polls = 0
+        self.matches = 0
+        self.messages = 0
+        self.alerts = 0
+        self.replayed_alerts = 0  # Raised during the outage, sent after it
+
+    def capacity(self) -> int:
+        hour = int((self.clock.now - START) // 3600) % 24
+        return PEAK_PLAYERS if hour >= 12 or hour < 1 else OFF_PEAK_PLAYERS
+
+    def get_detailed_players(self) -> dict:
+        rng = self.rng
+        self.polls += 1
+
+        for player_id in list(self.online):
+            if rng.random() < 0.005:
+                del self.online[player_id]
+        capacity = self.capacity()
+        while len(self.online) > capacity:
+            del self.online[rng.choice(list(self.online))]
+        while len(self.online) < capacity:
+            self.unique_players += 1
+            player_id = f"76561190{self.unique_players:09d}"
+            self.online[player_id] = {
+                "player_id": player_id,
+                "name": f"player{self.unique_players}",
+                "level": rng.randint(1, 400),
+                "team": rng.choice(TEAMS),
+                "unit_name": rng.choice(UNITS),
+                "role": rng.choice(ROLES)
+            }
+        self.max_online = max(self.max_online, len(self.online))
+
+        for player in rng.sample(list(self.online.values()), 5):
+            player["unit_name"] = rng.choice(UNITS)
+            player["role"] = rng.choice(ROLES)
+
+        return {
+            "players": {
+                player_id: dict(player)
+                for player_id, player in self.online.items()
+            }
+        }
+
+    def get_recent_logs(
+        self,
+        action_filter: list,
+        min_timestamp: int,
+        exact_action: bool
+    ) -> dict:
+        now = self.clock.now
+        match_end = now - (now - START) % MATCH_DURATION
+        if match_end > START and min_timestamp < match_end:
+            self.matches += 1
+            return {
+                "logs": [
+                    {"action": "MATCH ENDED", "timestamp_ms": match_end * 1000}
+                ]
+            }
+        return {"logs": []}
+
+    def message_player(
+        self,
+        player_id: str,
+        message: str,
+        by: str
+    ) -> None:
+        self.messages += 1
+
+    def get_player_profile(
+        self,
+        player_id: str,
+        nb_sessions: int
+    ) -> dict:
+        return {"steaminfo": {"country": COUNTRIES[int(player_id) % 5]}}
+
+    def discord_embed_send(
+        self,
+        embed,
+        webhook
+    ) -> None:
+        if DISCORD_OUTAGE[0] <= self.clock.now < DISCORD_OUTAGE[1]:
+            raise ConnectionError("Discord is unreachable")
+        self.alerts += 1
+        if DISCORD_OUTAGE[0] <= embed.timestamp.timestamp() < DISCORD_OUTAGE[1]:
+            self.replayed_alerts += 1
+
+
+def deep_sizeof(obj) -> int:
+    """
+    Size of obj and of everything it references (shared objects counted once)
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+    return size
+
+
+class MemorySampler:
+    """
+    Records the heap size, and the size of each component
+    holding per-player data, once every SAMPLE_INTERVAL simulated seconds
+    (the number of players tracked is checked on each poll).
+    """
+    def __init__(self):
+        self.known_all: dict = {}
+        self.max_known_all = 0
+        self.vacancies = None
+        self.reminded_squads: set = set()
+        self.spool_path = None
+        self.spool_after_outage = None  # Alerts left 1 hour after the outage
+        self.clock = None
+        self.next_sample = START
+        self.heap: list[tuple[float, int]] = []
+        self.peaks: dict[str, tuple[int, int]] = {}  # name : (bytes, entries)
+
+    def components(self) -> dict[str, tuple[int, int]]:
+        """
+        Returns (bytes, entries) for each component
+        """
+        pools = (watch_roles.executor, watch_roles.lookup_executor)
+        caches = {
+            "player_languages": watch_roles.player_languages,
+            "avatar_urls": watch_roles.avatar_urls,
+            "profile_urls": watch_roles.profile_urls
+        }
+        sizes = {
+            "known_all": (deep_sizeof(self.known_all), len(self.known_all)),
+            "officer vacancies": (
+                deep_sizeof(self.vacancies) + deep_sizeof(self.reminded_squads),
+                (len(self.vacancies.timers) if self.vacancies else 0)
+                + len(self.reminded_squads)
+            ),
+            "shadow totals": (
+                deep_sizeof(watch_roles.shadow_evaluator.totals),
+                len(watch_roles.shadow_evaluator.totals)
+            ),
+            "executors": (
+                sum(
+                    deep_sizeof(pool.counters) + deep_sizeof(pool.breakers)
+                    for pool in pools
+                ),
+                sum(len(pool.counters) + len(pool.breakers) for pool in pools)
+            ),
+            "discord spool (file)": (
+                os.path.getsize(self.spool_path)
+                if self.spool_path and os.path.exists(self.spool_path) else 0,
+                watch_roles.discord_spool.size
+            )
+        }
+        for name, cache in caches.items():
+            sizes[name] = (deep_sizeof(cache.entries), len(cache.entries))
+        return sizes
+
+    def sample(self) -> None:
+        """
+        Called by the main loop at the end of each poll
+        """
+        self.max_known_all = max(self.max_known_all, len(self.known_all))
+        if self.clock.now < self.next_sample:
+            return
+        self.next_sample += SAMPLE_INTERVAL
+
+        if (
+            self.spool_after_outage is None
+            and self.clock.now >= DISCORD_OUTAGE[1] + 3600
+        ):
+            self.spool_after_outage = watch_roles.discord_spool.size
+
+        for name, (size, entries) in self.components().items():
+            peak_size, peak_entries = self.peaks.get(name, (0, 0))
+            self.peaks[name] = (max(size, peak_size), max(entries, peak_entries))
+        gc.collect()
+        self.heap.append((self.clock.now, tracemalloc.get_traced_memory()[0]))
+
+
+def run_soak(
+    monkeypatch,
+    tmp_path,
+    days: float
+) -> tuple[SimServer, MemorySampler]:
+    sampler = MemorySampler()
+    clock = SimClock(START, START + days * 86400, sampler.sample)
+    sampler.clock = clock
+    server = SimServer(clock)
+
+    class SimDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(clock.now, tz)
+
+    class RecordedTimerWheel(watch_roles.TimerWheel):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            sampler.vacancies = self
+
+    clean_departed_players = watch_roles.clean_departed_players
+
+    def record_known_all(realtime_all, known_all):
+        sampler.known_all = known_all
+        return clean_departed_players(realtime_all, known_all)
+
+    update_officer_vacancies = watch_roles.update_officer_vacancies
+
+    def record_reminded_squads(vacancies, reminded, snapshot, now):
+        sampler.reminded_squads = reminded
+        return update_officer_vacancies(vacancies, reminded, snapshot, now)
+
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    monkeypatch.setattr(watch_roles, "monotonic", clock.monotonic)
+    monkeypatch.setattr(watch_roles, "datetime", SimDateTime)
+    monkeypatch.setattr(watch_roles, "TimerWheel", RecordedTimerWheel)
+    monkeypatch.setattr(watch_roles, "clean_departed_players", record_known_all)
+    monkeypatch.setattr(
+        watch_roles, "update_officer_vacancies", record_reminded_squads
+    )
+    monkeypatch.setattr(watch_roles, "Rcon", lambda server_info: server)
+    monkeypatch.setattr(watch_roles, "get_recent_logs", server.get_recent_logs)
+    monkeypatch.setattr(
+        watch_roles, "get_player_profile", server.get_player_profile
+    )
+    monkeypatch.setattr(
+        watch_roles, "discord_embed_send", server.discord_embed_send
+    )
+    monkeypatch.setattr(
+        watch_roles,
+        "derived_config",
+        dataclasses.replace(
+            watch_roles.derived_config,
+            webhook_url="https://discord.com/api/webhooks/1/soak",
+            alerts_enabled=True
+        )
+    )
+    monkeypatch.setattr(watch_roles.config, "LAG_WATCHDOG_THRESHOLD", 0)
+    monkeypatch.setattr(watch_roles.config, "DISCORD_SPOOL_DIR", str(tmp_path))
+    sampler.spool_path = os.path.join(
+        str(tmp_path), "watch_roles_discord_spool_1.jsonl"
+    )
+
+    async def main():
+        clock.main_task = asyncio.current_task()
+        await watch_roles.track_role_changes_async()
+
+    log_level = watch_roles.logger.level
+    watch_roles.logger.setLevel(logging.CRITICAL)
+    tracemalloc.start()
+    try:
+        asyncio.run(main())
+    except SoakFinished:
+        pass
+    finally:
+        tracemalloc.stop()
+        watch_roles.logger.setLevel(log_level)
+
+    return server, sampler
+
+
+def test_memory_stays_bounded(monkeypatch, tmp_path, capsys):
+    server, sampler = run_soak(monkeypatch, tmp_path, DAYS)
+
+    # Day 1 : the caches fill up, the Discord outage fills the spool
+    daily_peaks: dict[int, int] = {}
+    for time, heap in sampler.heap:
+        day = int((time - START) // 86400) + 1
+        daily_peaks[day] = max(heap, daily_peaks.get(day, 0))
+
+    with capsys.disabled():
+        print(
+            f"\nSoak : {DAYS:g} simulated days, {server.polls} polls,"
+            f" {server.unique_players} unique players,"
+            f" {server.matches} matches, {server.messages} messages,"
+            f" {server.alerts} Discord alerts"
+            f" ({server.replayed_alerts} replayed after the outage)"
+        )
+        print(f"{'component':<24}{'peak KiB':>10}{'peak entries':>14}")
+        for name, (size, entries) in sorted(sampler.peaks.items()):
+            print(f"{name:<24}{size / 1024:>10.1f}{entries:>14}")
+        print(
+            "heap (tracemalloc) peak KiB, per day : "
+            + ", ".join(
+                f"{day}: {heap / 1024:.1f}" for day, heap in daily_peaks.items()
+            )
+        )
+
+    # The simulation did run
+    assert server.unique_players > 10 * PEAK_PLAYERS
+    assert server.matches >= int(DAYS * 86400 / MATCH_DURATION) - 1
+    assert server.alerts > 0
+
+    # Only the players online are tracked
+    assert sampler.max_known_all <= server.max_online
+    for name in ("player_languages", "avatar_urls", "profile_urls"):
+        assert sampler.peaks[name][1] <= watch_roles.config.PROFILE_CACHE_SIZE
+    assert sampler.peaks["officer vacancies"][1] <= 2 * len(UNITS)
+    # The spool is compacted as soon as it exceeds its limit
+    assert (
+        sampler.peaks["discord spool (file)"][1]
+        <= watch_roles.config.DISCORD_SPOOL_MAX + 1
+    )
+
+    # The alerts raised during the outage have been replayed
+    assert server.replayed_alerts > 0
+    assert sampler.spool_after_outage == 0
+
+    # What the outage used has been released,
+    # then the heap doesn't grow (5% margin) after day 1
+    for day, peak in daily_peaks.items():
+        if day > 1:
+            assert peak <= daily_peaks[1] * 1.05 + 16 * 1024, f"day {day}"